@@ -0,0 +1,223 @@
+"""
+browser_session.py — 诊断脚本共用的常驻浏览器会话
+
+第一次调用时以独立进程启动 Chromium（使用 browser_data 持久化配置并开启远程调试端口），
+把 pid 与 CDP 地址写入 browser_data/.cdp；之后的诊断脚本直接通过 CDP 连接这个
+常驻浏览器，省去每次冷启动 Chromium 的开销，也避免多个脚本争用同一个配置目录。
+
+诊断脚本统一通过 launched_context() 获取 (context, page)，反检测脚本也在这里注入。
+
+注意：常驻浏览器运行期间会占用 browser_data，正式爬取（main.py / webui.py）前请先关闭：
+    python browser_session.py --stop
+"""
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import urllib.request
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+from playwright.async_api import BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from stealth import STEALTH_JS
+
+# 与 scraper.USER_DATA_DIR 相同，不随当前工作目录变化
+BROWSER_DATA_DIR = Path(__file__).parent / "browser_data"
+CDP_FILE = BROWSER_DATA_DIR / ".cdp"
+
+# 等待 Chromium 写出 DevToolsActivePort 的最长时间（秒）
+LAUNCH_TIMEOUT = 15
+
+# 各类弹窗的关闭按钮，合并成一个选择器，由浏览器一次性匹配第一个可见元素
+POPUP_SELECTORS = (
+    'button:has-text("关闭")',
+    'button:has-text("我知道了")',
+    ".Modal-closeButton",
+    ".css-1mfkfn3",
+)
+POPUP_SELECTOR = ", ".join(POPUP_SELECTORS) + " >> visible=true"
+
+
+def _read_session() -> dict:
+    """读取 .cdp 中记录的 {pid, endpoint}，不存在或损坏时返回空字典。"""
+    try:
+        return json.loads(CDP_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+async def _launch_daemon(pw: Playwright) -> str:
+    """以脱离当前进程的方式启动 Chromium，返回其 CDP 地址。"""
+    # 记录的 CDP 地址连不上，但原来的进程还在（如卡死）：不能在同一配置目录上再启动一个
+    session = _read_session()
+    if _is_session_browser(session):
+        raise RuntimeError(
+            f"常驻浏览器（pid {session['pid']}）仍在运行但无法连接，"
+            "请先运行 python browser_session.py --stop 关闭它"
+        )
+    BROWSER_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    port_file = BROWSER_DATA_DIR / "DevToolsActivePort"
+    port_file.unlink(missing_ok=True)
+
+    proc = subprocess.Popen(
+        [
+            pw.chromium.executable_path,
+            f"--user-data-dir={BROWSER_DATA_DIR.resolve()}",
+            "--remote-debugging-port=0",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--window-size=1280,800",
+            "--lang=zh-CN",
+            "about:blank",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    # --remote-debugging-port=0 会随机选端口，并写入 DevToolsActivePort 的第一行
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LAUNCH_TIMEOUT
+    while loop.time() < deadline:
+        try:
+            port = port_file.read_text(encoding="utf-8").splitlines()[0].strip()
+            if port:
+                break
+        except (OSError, IndexError):
+            pass
+        await asyncio.sleep(0.1)
+    else:
+        proc.kill()
+        raise RuntimeError("Chromium 启动超时，未能获取远程调试端口")
+
+    endpoint = f"http://127.0.0.1:{port}"
+    CDP_FILE.write_text(
+        json.dumps({"pid": proc.pid, "endpoint": endpoint}), encoding="utf-8"
+    )
+    return endpoint
+
+
+async def get_or_launch_context(pw: Playwright) -> tuple[BrowserContext, Page]:
+    """
+    连接常驻浏览器（不存在时先启动），返回 (持久化上下文, 新页面)。
+
+    调用方退出时不要关闭 context，浏览器会保留给下一个诊断脚本复用；
+    返回的页面用完后需要自行关闭（launched_context() 会处理）。
+    """
+    browser = None
+    endpoint = _read_session().get("endpoint")
+    if endpoint:
+        try:
+            browser = await pw.chromium.connect_over_cdp(endpoint, timeout=3000)
+        except Exception:
+            browser = None
+
+    if browser is None:
+        endpoint = await _launch_daemon(pw)
+        browser = await pw.chromium.connect_over_cdp(endpoint)
+
+    context = browser.contexts[0]
+    # 通过 CDP 注册的初始化脚本只对本次连接中新建的页面生效、断开时随之失效，
+    # 每个诊断脚本都是新连接，因此每次连接都要重新注册一次
+    await context.add_init_script(STEALTH_JS)
+
+    page = await context.new_page()
+    await page.set_viewport_size({"width": 1280, "height": 800})
+    return context, page
+
+
+@asynccontextmanager
+async def launched_context() -> AsyncIterator[tuple[BrowserContext, Page]]:
+    """
+    诊断脚本的统一入口::
+
+        async with launched_context() as (context, page):
+            ...
+
+    退出时关闭本次打开的页面并断开 Playwright 连接，不关闭常驻浏览器，
+    多次运行诊断脚本也不会在常驻浏览器里留下越来越多的标签页。
+    """
+    async with async_playwright() as pw:
+        context, page = await get_or_launch_context(pw)
+        try:
+            yield context, page
+        finally:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+async def wait_until_idle(page: Page, timeout: int = 5000) -> None:
+    """等待页面网络空闲，最多 timeout 毫秒（知乎页面常有长连接，超时即继续）。"""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except PlaywrightTimeoutError:
+        pass
+
+
+async def dismiss_popups(page: Page) -> None:
+    """关闭登录/提示弹窗（如果有），没有弹窗时最多等待 1 秒。"""
+    try:
+        await page.locator(POPUP_SELECTOR).first.click(timeout=1000)
+        await asyncio.sleep(0.5)
+    except Exception:
+        pass
+
+
+def _is_session_browser(session: dict) -> bool:
+    """
+    确认 .cdp 中记录的 pid 仍是当初启动的 Chromium。
+    重启后 .cdp 可能是残留的，pid 也可能已被其他进程复用，不能直接结束它。
+
+    有 /proc 时检查进程命令行中的 --user-data-dir；否则（macOS / Windows）
+    探测记录的 CDP 地址是否仍有浏览器在响应。
+    """
+    pid = session.get("pid")
+    if not pid:
+        return False
+    if Path("/proc/self/cmdline").exists():
+        try:
+            args = Path(f"/proc/{pid}/cmdline").read_bytes().split(b"\0")
+        except OSError:
+            return False
+        return f"--user-data-dir={BROWSER_DATA_DIR.resolve()}".encode() in args
+    endpoint = session.get("endpoint")
+    if not endpoint:
+        return False
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=2):
+            return True
+    except Exception:
+        return False
+
+
+def daemon_running() -> bool:
+    """常驻浏览器是否仍在运行（仍占用 browser_data）。"""
+    return _is_session_browser(_read_session())
+
+
+def stop_daemon() -> bool:
+    """结束常驻浏览器进程，返回是否找到并结束了进程。"""
+    session = _read_session()
+    CDP_FILE.unlink(missing_ok=True)
+    if not _is_session_browser(session):
+        return False
+    pid = session["pid"]
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    if "--stop" in sys.argv[1:]:
+        print("已关闭常驻浏览器。" if stop_daemon() else "没有正在运行的常驻浏览器。")
+    else:
+        print(__doc__)
@@ -1,173 +1,147 @@
 """
 诊断脚本：测试知乎评论 API 的实际响应格式。
+
+成功的响应会缓存在本地（见 response_cache.py），重复运行时直接读取；
+需要强制重新请求时使用：python debug_comments.py --no-cache
 """
 import asyncio
 import json
-from playwright.async_api import async_playwright
-from stealth import STEALTH_JS
-from pathlib import Path
+import sys
+import httpx
+from browser_session import dismiss_popups, launched_context, wait_until_idle
+from response_cache import ResponseCache
 
-BROWSER_DATA_DIR = Path("browser_data")
 ANSWER_ID = "1987244067499828553"
 
 
+async def fetch_probe(
+    client: httpx.AsyncClient, url: str, cache: ResponseCache | None = None
+) -> dict:
+    """
+    请求一个 API 地址，返回 {status, headers, body}，出错时返回 {error}。
+    命中缓存时直接返回缓存内容，并带上 cached=True。
+    """
+    if cache is not None:
+        hit = cache.get(url)
+        if hit is not None:
+            return {**hit, "cached": True}
+    try:
+        resp = await client.get(url)
+    except Exception as e:
+        return {"error": str(e)}
+    result = {"status": resp.status_code, "headers": dict(resp.headers), "body": resp.text}
+    if cache is not None and resp.status_code == 200:
+        cache.set(url, result)
+    return result
+
+
+def status_line(result: dict) -> str:
+    return f"状态码: {result.get('status')}" + (" (cached)" if result.get("cached") else "")
+
+
+def print_body(body: str) -> None:
+    """优先按 JSON 美化打印响应体，截断到 3000 字符。"""
+    try:
+        parsed = json.loads(body)
+        print(json.dumps(parsed, ensure_ascii=False, indent=2)[:3000])
+    except:
+        print(body[:3000])
+
+
 async def main():
-    async with async_playwright() as pw:
-        context = await pw.chromium.launch_persistent_context(
-            user_data_dir=str(BROWSER_DATA_DIR),
-            headless=False,
-            viewport={"width": 1280, "height": 800},
-            locale="zh-CN",
-        )
-        page = context.pages[0] if context.pages else await context.new_page()
-        await page.add_init_script(STEALTH_JS)
-
-        # 先访问知乎页面（确保在知乎域名下）
+    # 复用常驻浏览器（已注入反检测脚本），避免每次冷启动 Chromium
+    async with launched_context() as (context, page):
+        # 先访问知乎页面（确保拿到知乎域名下的 Cookie）
         url = f"https://www.zhihu.com/question/319652618/answer/{ANSWER_ID}"
         print(f"访问: {url}")
         await page.goto(url, wait_until="domcontentloaded")
-        await asyncio.sleep(5)
+        await wait_until_idle(page)
 
         # 关闭弹窗
-        for sel in [
-            'button:has-text("关闭")',
-            'button:has-text("我知道了")',
-            ".Modal-closeButton",
-        ]:
-            try:
-                btn = page.locator(sel).first
-                if await btn.count() > 0 and await btn.is_visible():
-                    await btn.click()
-                    await asyncio.sleep(0.5)
-            except Exception:
-                pass
-
-        # 测试 comment_v5 API
-        print("\n=== 测试 comment_v5 API ===")
-        api_url = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=20&offset="
-        print(f"请求: {api_url}")
-
-        result = await page.evaluate("""
-            async (url) => {
-                try {
-                    const resp = await fetch(url, { credentials: 'include' });
-                    const status = resp.status;
-                    const headers = {};
-                    resp.headers.forEach((v, k) => headers[k] = v);
-                    const text = await resp.text();
-                    return { status, headers, body: text.substring(0, 3000) };
-                } catch (e) {
-                    return { error: e.message };
-                }
-            }
-        """, api_url)
-
-        print(f"状态码: {result.get('status')}")
-        if result.get('error'):
-            print(f"错误: {result['error']}")
-        else:
-            body = result.get('body', '')
-            print(f"响应体前 3000 字符:")
-            try:
-                parsed = json.loads(body)
-                print(json.dumps(parsed, ensure_ascii=False, indent=2)[:3000])
-            except:
-                print(body[:3000])
-
-        # 测试旧版 API
-        print("\n=== 测试旧版 comments API ===")
-        old_api_url = f"https://www.zhihu.com/api/v4/answers/{ANSWER_ID}/comments?limit=20&offset=0&order_by=normal&status=open"
-        print(f"请求: {old_api_url}")
-
-        result2 = await page.evaluate("""
-            async (url) => {
-                try {
-                    const resp = await fetch(url, { credentials: 'include' });
-                    const status = resp.status;
-                    const text = await resp.text();
-                    return { status, body: text.substring(0, 3000) };
-                } catch (e) {
-                    return { error: e.message };
-                }
-            }
-        """, old_api_url)
-
-        print(f"状态码: {result2.get('status')}")
-        if result2.get('error'):
-            print(f"错误: {result2['error']}")
-        else:
-            body2 = result2.get('body', '')
-            try:
-                parsed2 = json.loads(body2)
-                print(json.dumps(parsed2, ensure_ascii=False, indent=2)[:3000])
-            except:
-                print(body2[:3000])
-
-        # 测试 comment_v5 不带 offset
-        print("\n=== 测试 comment_v5 不带 offset ===")
-        api_url3 = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=20"
-        print(f"请求: {api_url3}")
-
-        result3 = await page.evaluate("""
-            async (url) => {
-                try {
-                    const resp = await fetch(url, { credentials: 'include' });
-                    const status = resp.status;
-                    const text = await resp.text();
-                    return { status, body: text.substring(0, 3000) };
-                } catch (e) {
-                    return { error: e.message };
-                }
-            }
-        """, api_url3)
-
-        print(f"状态码: {result3.get('status')}")
-        if result3.get('error'):
-            print(f"错误: {result3['error']}")
-        else:
-            body3 = result3.get('body', '')
-            try:
-                parsed3 = json.loads(body3)
-                print(json.dumps(parsed3, ensure_ascii=False, indent=2)[:3000])
-            except:
-                print(body3[:3000])
-
-        # 测试 comment_v5 带 cursor
-        print("\n=== 测试 comment_v5 带 cursor ===")
-        api_url4 = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=5&offset="
-        print(f"请求: {api_url4}")
-
-        result4 = await page.evaluate("""
-            async (url) => {
-                try {
-                    const resp = await fetch(url, { credentials: 'include' });
-                    const status = resp.status;
-                    const json_data = await resp.json();
-                    return {
-                        status,
-                        data_length: json_data.data ? json_data.data.length : 0,
-                        paging: json_data.paging || null,
-                        first_comment_keys: json_data.data && json_data.data[0] ? Object.keys(json_data.data[0]) : [],
-                        first_comment_id: json_data.data && json_data.data[0] ? json_data.data[0].id : null,
-                        first_comment_content: json_data.data && json_data.data[0] ? (json_data.data[0].content || '').substring(0, 100) : null,
-                        first_comment_author: json_data.data && json_data.data[0] && json_data.data[0].author ? json_data.data[0].author : null,
-                    };
-                } catch (e) {
-                    return { error: e.message };
-                }
-            }
-        """, api_url4)
-
-        print(f"状态码: {result4.get('status')}")
-        print(f"data 长度: {result4.get('data_length')}")
-        print(f"paging: {json.dumps(result4.get('paging'), ensure_ascii=False, indent=2) if result4.get('paging') else 'None'}")
-        print(f"第一条评论 keys: {result4.get('first_comment_keys')}")
-        print(f"第一条评论 id: {result4.get('first_comment_id')}")
-        print(f"第一条评论内容: {result4.get('first_comment_content')}")
-        print(f"第一条评论作者: {json.dumps(result4.get('first_comment_author'), ensure_ascii=False, indent=2) if result4.get('first_comment_author') else 'None'}")
-
-        input("\n按 Enter 关闭浏览器...")
-        await context.close()
+        await dismiss_popups(page)
+
+        # 导出浏览器 Cookie，后续 API 请求复用同一个 httpx 连接池
+        cookies = {c["name"]: c["value"] for c in await context.cookies()}
+        user_agent = await page.evaluate("navigator.userAgent")
+
+        # 响应缓存按登录身份（z_c0 Cookie）区分
+        cache = None if "--no-cache" in sys.argv[1:] else ResponseCache(identity=cookies.get("z_c0", ""))
+
+        async with httpx.AsyncClient(
+            http2=True,
+            cookies=cookies,
+            headers={"User-Agent": user_agent, "Referer": url},
+            limits=httpx.Limits(max_keepalive_connections=10),
+            timeout=30.0,
+        ) as client:
+
+            api_url = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=20&offset="
+            old_api_url = f"https://www.zhihu.com/api/v4/answers/{ANSWER_ID}/comments?limit=20&offset=0&order_by=normal&status=open"
+            api_url3 = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=20"
+            api_url4 = f"https://www.zhihu.com/api/v4/comment_v5/answers/{ANSWER_ID}/root_comment?order_by=score&limit=5&offset="
+
+            # 四个探测请求互不依赖，并发发出，结果按原顺序打印
+            result, result2, result3, result4 = await asyncio.gather(
+                *(fetch_probe(client, u, cache) for u in (api_url, old_api_url, api_url3, api_url4))
+            )
+
+            # 测试 comment_v5 API
+            print("\n=== 测试 comment_v5 API ===")
+            print(f"请求: {api_url}")
+
+            print(status_line(result))
+            if result.get('error'):
+                print(f"错误: {result['error']}")
+            else:
+                print(f"响应体前 3000 字符:")
+                print_body(result.get('body', ''))
+
+            # 测试旧版 API
+            print("\n=== 测试旧版 comments API ===")
+            print(f"请求: {old_api_url}")
+
+            print(status_line(result2))
+            if result2.get('error'):
+                print(f"错误: {result2['error']}")
+            else:
+                print_body(result2.get('body', ''))
+
+            # 测试 comment_v5 不带 offset
+            print("\n=== 测试 comment_v5 不带 offset ===")
+            print(f"请求: {api_url3}")
+
+            print(status_line(result3))
+            if result3.get('error'):
+                print(f"错误: {result3['error']}")
+            else:
+                print_body(result3.get('body', ''))
+
+            # 测试 comment_v5 带 cursor
+            print("\n=== 测试 comment_v5 带 cursor ===")
+            print(f"请求: {api_url4}")
+
+            print(status_line(result4))
+            if result4.get('error'):
+                print(f"错误: {result4['error']}")
+            else:
+                try:
+                    json_data = json.loads(result4.get('body', ''))
+                except Exception as e:
+                    json_data = {}
+                    print(f"错误: {e}")
+                data = json_data.get('data') or []
+                first = data[0] if data else {}
+                paging = json_data.get('paging')
+                author = first.get('author')
+                print(f"data 长度: {len(data)}")
+                print(f"paging: {json.dumps(paging, ensure_ascii=False, indent=2) if paging else 'None'}")
+                print(f"第一条评论 keys: {list(first.keys())}")
+                print(f"第一条评论 id: {first.get('id')}")
+                print(f"第一条评论内容: {(first.get('content') or '')[:100] if first else None}")
+                print(f"第一条评论作者: {json.dumps(author, ensure_ascii=False, indent=2) if author else 'None'}")
+
+        # 不关闭 context：浏览器保持运行，供下一次诊断复用
+        input("\n按 Enter 退出...")
 
 
 if __name__ == "__main__":
@@ -2,47 +2,58 @@
 诊断脚本：检查知乎用户回答页面的滚动容器和链接加载情况。
 """
 import asyncio
-from playwright.async_api import async_playwright
-from stealth import STEALTH_JS
-from pathlib import Path
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_session import dismiss_popups, launched_context, wait_until_idle
 
-BROWSER_DATA_DIR = Path("browser_data")
+# 一次 JS 往返同时取回答链接数量与当前滚动位置，避免把每个元素句柄都序列化回 Python
+LINK_STATS_JS = """() => ({
+    links: document.querySelectorAll('a[href*="/answer/"]').length,
+    scrollY: window.scrollY,
+})"""
+
+
+async def link_stats(page) -> dict:
+    """返回 {links: 回答链接数量, scrollY: 当前滚动位置}。"""
+    return await page.evaluate(LINK_STATS_JS)
+
+
+def _is_answers_api(resp) -> bool:
+    return "/api/v4" in resp.url and "answers" in resp.url
+
+
+async def scroll_and_wait(page, action, timeout: int = 3000) -> None:
+    """执行一次滚动动作，并等到回答列表 API 返回为止；timeout 毫秒内没有新请求则直接继续。"""
+    try:
+        async with page.expect_response(_is_answers_api, timeout=timeout):
+            await action()
+    except PlaywrightTimeoutError:
+        pass
 
 
 async def main():
-    async with async_playwright() as pw:
-        context = await pw.chromium.launch_persistent_context(
-            user_data_dir=str(BROWSER_DATA_DIR),
-            headless=False,
-            viewport={"width": 1280, "height": 800},
-            locale="zh-CN",
-        )
-        page = context.pages[0] if context.pages else await context.new_page()
-        await page.add_init_script(STEALTH_JS)
+    # 复用常驻浏览器（已注入反检测脚本），避免每次冷启动 Chromium
+    async with launched_context() as (context, page):
+        # 在导航之前注册请求监听，记录完整的 API 请求时间线
+        api_requests = []
+
+        def _on_request(req):
+            u = req.url.lower()
+            if "api" in u or "answers" in u:
+                api_requests.append(req.url)
+
+        page.on("request", _on_request)
 
         url = "https://www.zhihu.com/people/heroblast/answers"
         print(f"访问: {url}")
         await page.goto(url, wait_until="domcontentloaded")
-        await asyncio.sleep(5)
+        await wait_until_idle(page)
 
         # 关闭弹窗
-        for sel in [
-            'button:has-text("关闭")',
-            'button:has-text("我知道了")',
-            ".Modal-closeButton",
-            ".css-1mfkfn3",
-        ]:
-            try:
-                btn = page.locator(sel).first
-                if await btn.count() > 0 and await btn.is_visible():
-                    await btn.click()
-                    await asyncio.sleep(0.5)
-            except Exception:
-                pass
+        await dismiss_popups(page)
 
         # 1. 检查初始链接数量
-        links = await page.query_selector_all('a[href*="/answer/"]')
-        print(f"\n初始链接数量: {len(links)}")
+        stats = await link_stats(page)
+        print(f"\n初始链接数量: {stats['links']}")
 
         # 2. 检查所有可能的滚动容器
         scroll_info = await page.evaluate("""() => {
@@ -76,13 +87,15 @@ async def main():
             }
             
             // 也找所有 overflow:auto 或 overflow:scroll 的元素
-            const allEls = document.querySelectorAll('*');
+            // 只看可能作为滚动容器的标签，并先用廉价的尺寸比较过滤，
+            // 尺寸满足条件的元素才调用代价较高的 getComputedStyle
+            const cands = document.querySelectorAll('div, main, section, article, ul');
             const scrollableEls = [];
-            for (const el of allEls) {
+            for (const el of cands) {
+                if (el.scrollHeight <= el.clientHeight + 10) continue;
                 const style = window.getComputedStyle(el);
-                if ((style.overflow === 'auto' || style.overflow === 'scroll' || 
-                     style.overflowY === 'auto' || style.overflowY === 'scroll') &&
-                    el.scrollHeight > el.clientHeight + 10) {
+                if (style.overflow === 'auto' || style.overflow === 'scroll' ||
+                    style.overflowY === 'auto' || style.overflowY === 'scroll') {
                     scrollableEls.push({
                         tag: el.tagName,
                         cls: el.className ? (typeof el.className === 'string' ? el.className.substring(0, 80) : '') : '',
@@ -108,45 +121,36 @@ async def main():
             print(f"  {s['tag']}.{s['cls'][:50]}: scrollH={s['scrollH']}, clientH={s['clientH']}, "
                   f"scrollT={s['scrollT']}, overflowY={s['overflowY']}")
 
-        # 3. 尝试不同的滚动方式并检查效果
+        # 3. 尝试不同的滚动方式并检查效果（每次滚动后等待回答 API 响应，而非固定 sleep）
         print("\n=== 测试滚动方式 ===")
 
         # 方式 A: window.scrollBy
-        before_links = len(await page.query_selector_all('a[href*="/answer/"]'))
-        before_scroll = await page.evaluate("window.scrollY")
+        before = await link_stats(page)
         for i in range(5):
-            await page.evaluate("window.scrollBy(0, 1000)")
-            await asyncio.sleep(1)
-        after_scroll = await page.evaluate("window.scrollY")
-        await asyncio.sleep(3)
-        after_links = len(await page.query_selector_all('a[href*="/answer/"]'))
-        print(f"  window.scrollBy: scrollY {before_scroll} -> {after_scroll}, links {before_links} -> {after_links}")
+            await scroll_and_wait(page, lambda: page.evaluate("window.scrollBy(0, 1000)"))
+        after = await link_stats(page)
+        print(f"  window.scrollBy: scrollY {before['scrollY']} -> {after['scrollY']}, "
+              f"links {before['links']} -> {after['links']}")
 
         # 方式 B: 键盘 End 键
-        before_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+        before_links = (await link_stats(page))["links"]
         for i in range(5):
-            await page.keyboard.press("End")
-            await asyncio.sleep(1)
-        await asyncio.sleep(3)
-        after_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+            await scroll_and_wait(page, lambda: page.keyboard.press("End"))
+        after_links = (await link_stats(page))["links"]
         print(f"  keyboard End: links {before_links} -> {after_links}")
 
         # 方式 C: 鼠标滚轮
-        before_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+        before_links = (await link_stats(page))["links"]
         for i in range(10):
-            await page.mouse.wheel(0, 800)
-            await asyncio.sleep(1)
-        await asyncio.sleep(3)
-        after_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+            await scroll_and_wait(page, lambda: page.mouse.wheel(0, 800))
+        after_links = (await link_stats(page))["links"]
         print(f"  mouse.wheel: links {before_links} -> {after_links}")
 
         # 方式 D: 滚动 document.documentElement
-        before_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+        before_links = (await link_stats(page))["links"]
         for i in range(5):
-            await page.evaluate("document.documentElement.scrollTop += 1000")
-            await asyncio.sleep(1)
-        await asyncio.sleep(3)
-        after_links = len(await page.query_selector_all('a[href*="/answer/"]'))
+            await scroll_and_wait(page, lambda: page.evaluate("document.documentElement.scrollTop += 1000"))
+        after_links = (await link_stats(page))["links"]
         print(f"  documentElement.scrollTop: links {before_links} -> {after_links}")
 
         # 4. 检查是否有分页按钮
@@ -166,29 +170,20 @@ async def main():
         for p in pagination:
             print(f"  {p['tag']}: '{p['text']}' href={p['href']}")
 
-        # 5. 检查知乎 API 请求模式
-        print("\n=== 等待 10 秒观察网络请求... ===")
-        api_requests = []
-        page.on("request", lambda req: api_requests.append(req.url) if "api" in req.url.lower() or "answers" in req.url.lower() else None)
-        
-        # 再滚动一些
-        for i in range(5):
-            await page.mouse.wheel(0, 1000)
-            await asyncio.sleep(2)
-        
-        print(f"  捕获到 {len(api_requests)} 个 API 请求:")
+        # 5. 检查知乎 API 请求模式（监听器在导航前注册，覆盖以上所有滚动方式）
+        print(f"\n=== 整个过程中捕获到 {len(api_requests)} 个 API 请求 ===")
         for r in api_requests[:20]:
             print(f"    {r[:150]}")
 
         # 最终链接数
-        final_links = await page.query_selector_all('a[href*="/answer/"]')
-        print(f"\n最终链接数量: {len(final_links)}")
+        final_links = (await link_stats(page))["links"]
+        print(f"\n最终链接数量: {final_links}")
 
         # 打印页面 URL（检查是否被重定向）
         print(f"当前页面 URL: {page.url}")
 
-        input("\n按 Enter 关闭浏览器...")
-        await context.close()
+        # 不关闭 context：浏览器保持运行，供下一次诊断复用
+        input("\n按 Enter 退出...")
 
 
 if __name__ == "__main__":
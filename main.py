@@ -23,15 +23,30 @@ main.py — 知蛛 (ZhiZhu) 知乎内容爬虫入口
 """
 
 import argparse
-import asyncio
+import math
 import sys
-
-from scraper import login, scrape_user, scrape_question, scrape_single_answer, scrape_user_pins
 from pathlib import Path
 
+# scraper 在各子命令分支中按需导入，`--help` 或参数错误时无需加载；
+# Playwright / httpx 则由 scraper 在真正发起爬取时才导入
+
+
+def _positive_float(value: str) -> float:
+    """argparse 类型：只接受大于 0 的有限数值，否则由 argparse 给出参数错误。"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是有效的数字: {value}")
+    if not (math.isfinite(number) and number > 0):
+        raise argparse.ArgumentTypeError(f"必须是大于 0 的数: {value}")
+    return number
 
-def _add_common_args(parser: argparse.ArgumentParser):
-    """为子命令添加公共参数。"""
+
+def _add_common_args(parser: argparse.ArgumentParser, pacing: bool = True):
+    """
+    为子命令添加公共参数。
+    pacing=False 时不添加 --delay-min/--delay-max/--qps（单个回答只加载一个页面，无需限速）。
+    """
     parser.add_argument(
         "--output", "-o",
         type=str,
@@ -43,18 +58,25 @@ def _add_common_args(parser: argparse.ArgumentParser):
         action="store_true",
         help="不下载图片",
     )
-    parser.add_argument(
-        "--delay-min",
-        type=float,
-        default=5.0,
-        help="请求间最小延迟秒数（默认 10）",
-    )
-    parser.add_argument(
-        "--delay-max",
-        type=float,
-        default=10.0,
-        help="请求间最大延迟秒数（默认 20）",
-    )
+    if pacing:
+        parser.add_argument(
+            "--delay-min",
+            type=float,
+            default=5.0,
+            help="请求间最小延迟秒数（默认 10）",
+        )
+        parser.add_argument(
+            "--delay-max",
+            type=float,
+            default=10.0,
+            help="请求间最大延迟秒数（默认 20）",
+        )
+        parser.add_argument(
+            "--qps",
+            type=_positive_float,
+            default=None,
+            help="按固定速率限速（每秒请求数），指定后忽略 --delay-min/--delay-max",
+        )
     parser.add_argument(
         "--headless",
         action="store_true",
@@ -62,6 +84,40 @@ def _add_common_args(parser: argparse.ArgumentParser):
     )
 
 
+def _common_kwargs(args: argparse.Namespace, pacing: bool = True) -> dict:
+    """
+    把公共参数转换为 scraper 函数的关键字参数。
+    pacing=False 时不传延迟参数、也不构造限速器（与 _add_common_args 的 pacing 对应）。
+    """
+    from scraper import TokenBucket
+
+    kwargs = {
+        "output_dir": Path(args.output) if args.output else None,
+        "download_img": not args.no_images,
+        "headless": args.headless,
+    }
+    if pacing:
+        kwargs["delay_min"] = args.delay_min
+        kwargs["delay_max"] = args.delay_max
+        # 令牌桶限速：默认按 --delay-min/--delay-max 的平均间隔，也可用 --qps 指定固定速率
+        kwargs["rate_limiter"] = (
+            TokenBucket(args.qps) if args.qps is not None
+            else TokenBucket.from_delay(args.delay_min, args.delay_max)
+        )
+    return kwargs
+
+
+def _run_with_client(scrape_fn, **kwargs) -> None:
+    """在一个共享的 HTTP/2 keep-alive 客户端中运行 scraper 协程，所有请求复用同一连接池。"""
+    from scraper import create_http_client, run_async
+
+    async def runner():
+        async with create_http_client() as client:
+            await scrape_fn(**kwargs, http_client=client)
+
+    run_async(runner())
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="知蛛 (ZhiZhu) — 知乎内容爬虫，保存为 Markdown",
@@ -122,6 +178,12 @@ def main():
         action="store_true",
         help="只爬取文章",
     )
+    scrape_parser.add_argument(
+        "--pages",
+        type=int,
+        default=3,
+        help="同时打开的内容页面数（默认 3，共享同一限速，设为 1 即逐个爬取）",
+    )
     _add_common_args(scrape_parser)
 
     # ── question 子命令（问题级） ──
@@ -137,6 +199,17 @@ def main():
         default=None,
         help="最多爬取的回答数量（默认全部）",
     )
+    question_parser.add_argument(
+        "--pages",
+        type=int,
+        default=3,
+        help="同时打开的回答页面数（默认 3，共享同一限速，设为 1 即逐个爬取）",
+    )
+    question_parser.add_argument(
+        "--refresh-links",
+        action="store_true",
+        help="重新收集回答列表（默认复用 24 小时内保存的 links.json）",
+    )
     _add_common_args(question_parser)
 
     # ── answer 子命令（单个回答） ──
@@ -151,7 +224,19 @@ def main():
         action="store_true",
         help="同时爬取评论区",
     )
-    _add_common_args(answer_parser)
+    answer_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="获取评论时同时在途的子评论请求数（默认 4）",
+    )
+    answer_parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="缓存评论 API 响应到 .cache/http/，1 小时内重复爬取同一回答时直接读盘（默认关闭）",
+    )
+    _add_common_args(answer_parser, pacing=False)
 
     # ── pins 子命令（用户想法） ──
     pins_parser = subparsers.add_parser("pins", help="爬取指定用户的所有想法")
@@ -160,6 +245,12 @@ def main():
         type=str,
         help="知乎用户的 URL token（个人主页 URL 中的标识符）",
     )
+    pins_parser.add_argument(
+        "--pages",
+        type=int,
+        default=3,
+        help="同时打开的想法页面数（默认 3，共享同一限速，设为 1 即逐个爬取）",
+    )
     _add_common_args(pins_parser)
 
     args = parser.parse_args()
@@ -169,9 +260,12 @@ def main():
         sys.exit(0)
 
     if args.command == "login":
-        asyncio.run(login(timeout=args.timeout))
+        from scraper import login, run_async
+        run_async(login(timeout=args.timeout))
 
     elif args.command == "scrape":
+        from scraper import scrape_user
+
         scrape_answers = True
         scrape_articles = True
 
@@ -180,63 +274,47 @@ def main():
         if args.only_articles:
             scrape_answers = False
 
-        output_dir = Path(args.output) if args.output else None
-
-        asyncio.run(
-            scrape_user(
-                user_url_token=args.user_url_token,
-                output_dir=output_dir,
-                scrape_answers=scrape_answers,
-                scrape_articles=scrape_articles,
-                download_img=not args.no_images,
-                delay_min=args.delay_min,
-                delay_max=args.delay_max,
-                headless=args.headless,
-            )
+        _run_with_client(
+            scrape_user,
+            user_url_token=args.user_url_token,
+            scrape_answers=scrape_answers,
+            scrape_articles=scrape_articles,
+            parallel_pages=args.pages,
+            **_common_kwargs(args),
         )
 
     elif args.command == "question":
-        output_dir = Path(args.output) if args.output else None
-
-        asyncio.run(
-            scrape_question(
-                question_input=args.question_input,
-                max_answers=args.max_answers,
-                output_dir=output_dir,
-                download_img=not args.no_images,
-                delay_min=args.delay_min,
-                delay_max=args.delay_max,
-                headless=args.headless,
-            )
+        from scraper import scrape_question
+
+        _run_with_client(
+            scrape_question,
+            question_input=args.question_input,
+            max_answers=args.max_answers,
+            parallel_pages=args.pages,
+            reuse_links=not args.refresh_links,
+            **_common_kwargs(args),
         )
 
     elif args.command == "answer":
-        output_dir = Path(args.output) if args.output else None
-
-        asyncio.run(
-            scrape_single_answer(
-                answer_input=args.answer_url,
-                output_dir=output_dir,
-                download_img=not args.no_images,
-                with_comments=args.with_comments,
-                delay_min=args.delay_min,
-                delay_max=args.delay_max,
-                headless=args.headless,
-            )
+        from scraper import scrape_single_answer
+
+        _run_with_client(
+            scrape_single_answer,
+            answer_input=args.answer_url,
+            with_comments=args.with_comments,
+            comment_concurrency=args.concurrency,
+            use_cache=args.cache,
+            **_common_kwargs(args, pacing=False),
         )
 
     elif args.command == "pins":
-        output_dir = Path(args.output) if args.output else None
-
-        asyncio.run(
-            scrape_user_pins(
-                user_url_token=args.user_url_token,
-                output_dir=output_dir,
-                download_img=not args.no_images,
-                delay_min=args.delay_min,
-                delay_max=args.delay_max,
-                headless=args.headless,
-            )
+        from scraper import scrape_user_pins
+
+        _run_with_client(
+            scrape_user_pins,
+            user_url_token=args.user_url_token,
+            parallel_pages=args.pages,
+            **_common_kwargs(args),
         )
 
 
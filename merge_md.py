@@ -20,47 +20,131 @@ merge_md.py — 将 output 中某个文件夹的所有 .md 文件合并为一个
 
     # 指定分隔符（默认为 ---）
     python merge_md.py output/heroblast/answers --separator "====="
+
+    # 输出文件比所有来源文件都新时会直接跳过；更换排序/分隔符/标题后需强制重新合并
+    python merge_md.py output/heroblast/answers --force
 """
 
 import argparse
+import errno
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# 日期只出现在文件头部的元信息里（前 600 个字符内），按 UTF-8 最多约 1800 字节
+_HEAD_BYTES = 2048
+
+# 头部日期行，如：> **日期**: 2025-12-24
+# 使用 UTF-8 字节版本，直接匹配原始字节，无需先解码
+_DATE_RE_BYTES = re.compile(r'>\s*\*\*日期\*\*:\s*(\d{4}-\d{2}-\d{2})'.encode("utf-8"))
+
+# 并行扫描文件头部时的线程数（读文件时会释放 GIL）
+_SCAN_WORKERS = 16
+
+# 按字节拷贝文件内容时每次读取的块大小
+_COPY_CHUNK = 1 << 20
+
+# 查找首尾空白时每次读取的块大小
+_STRIP_CHUNK = 4096
+
+# Linux 上 sendfile 可以直接在两个普通文件之间拷贝（macOS 只支持写入 socket）
+_USE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+# 预先为输出文件分配磁盘空间（macOS / Windows 没有 posix_fallocate）
+_USE_FALLOCATE = hasattr(os, "posix_fallocate")
+
+
 # ── 工具函数 ──────────────────────────────────────────────────
 
-def collect_md_files(root: Path) -> list[Path]:
+def walk_sources(root: Path) -> tuple[list[Path], list[str]]:
     """
-    从指定根目录中收集所有 .md 文件。
+    遍历根目录，返回 (所有 .md 文件, 遍历过的所有目录)。
     支持两种结构：
       - <root>/<子文件夹>/index.md
       - <root>/<文件>.md
+
+    使用 os.scandir 迭代遍历：DirEntry 自带文件类型，无需逐个 stat，
+    也只为匹配到的文件构造 Path 对象。
     """
     files: list[Path] = []
-    for path in root.rglob("*.md"):
-        files.append(path)
-    return files
+    dirs: list[str] = []
+    stack = [str(root)]
+    while stack:
+        path = stack.pop()
+        dirs.append(path)
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    files.append(Path(entry.path))
+    return files, dirs
+
+
+def collect_md_files(root: Path) -> list[Path]:
+    """从指定根目录中收集所有 .md 文件（见 walk_sources）。"""
+    return walk_sources(root)[0]
+
+
+def read_header_date(path: Path) -> str:
+    """
+    从文件头部的元信息中提取日期字符串（YYYY-MM-DD），格式如：> **日期**: 2025-12-24
+    只读取文件开头的一小段字节，避免为排序而完整读取并解码整个文件；
+    正则直接作用于原始字节，找不到或读取失败时返回空字符串。
+    """
+    try:
+        with path.open("rb") as f:
+            head = f.read(_HEAD_BYTES)
+    except Exception:
+        return ""
+    m = _DATE_RE_BYTES.search(head)
+    return m.group(1).decode("ascii") if m else ""
+
+
+def _stat_all(paths) -> list[os.stat_result]:
+    """
+    并行 stat 一批路径（stat 同样会释放 GIL），结果与输入顺序一致。
+    文件很多、又位于网络盘上时，逐个串行 stat 的往返延迟会成为主要耗时。
+    """
+    with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as ex:
+        return list(ex.map(os.stat, paths))
 
 
-def extract_date_from_header(text: str) -> str:
+def newest_mtime(files: list[Path], dirs: list[str]) -> float:
     """
-    从 Markdown 文件头部的元信息中提取日期字符串（YYYY-MM-DD）。
-    格式如：> **日期**: 2025-12-24
-    找不到时返回空字符串。
+    返回来源文件及遍历过的所有目录中最新的修改时间。
+    目录也计入在内：删除或新增文件（或整个子文件夹）会更新其上一级目录的 mtime，
+    中间层目录同样要检查，否则删掉 <类型目录>/<子文件夹>/ 时不会被发现。
     """
-    m = re.search(r'>\s*\*\*日期\*\*:\s*(\d{4}-\d{2}-\d{2})', text[:600])
-    return m.group(1) if m else ""
+    return max(st.st_mtime for st in _stat_all([*files, *dirs]))
 
 
-def sort_key_by_date(path: Path) -> tuple[str, str]:
-    """按文件头部日期排序，日期相同时按文件路径排序。"""
+def _preallocate(out, files: list[Path], extra: int) -> None:
+    """
+    按来源文件大小之和（再加上文件头与分隔符）一次性为输出文件预留磁盘空间，
+    避免边写边扩展造成的碎片；空间不足时在写入前就报错退出。
+    预留的是上限（正文还会去掉首尾空白），写完后需截断到实际长度。
+    """
     try:
-        text = path.read_text(encoding="utf-8")
-    except Exception:
-        text = ""
-    date = extract_date_from_header(text)
-    return (date, str(path))
+        total = extra + sum(st.st_size for st in _stat_all(files))
+    except OSError:
+        # 个别文件无法访问时（合并时会跳过它），按能访问到的文件估算
+        total = extra
+        for p in files:
+            try:
+                total += p.stat().st_size
+            except OSError:
+                pass
+    try:
+        os.posix_fallocate(out.fileno(), 0, total)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            print(f"[ERR] 磁盘空间不足，需要约 {total} 字节: {out.name}", file=sys.stderr)
+            sys.exit(1)
+        # 文件系统不支持预分配时（如部分网络盘）直接按普通方式写入
 
 
 def sort_key_by_name(path: Path) -> str:
@@ -68,6 +152,67 @@ def sort_key_by_name(path: Path) -> str:
     return str(path)
 
 
+def _stripped_span(f, size: int) -> tuple[int, int]:
+    """
+    返回文件去掉首尾空白后的字节区间 [start, end)。
+    只读取首尾的少量字节，效果等同于对 ASCII 空白做 str.strip()。
+    """
+    start = 0
+    while start < size:
+        f.seek(start)
+        chunk = f.read(_STRIP_CHUNK)
+        if not chunk:
+            break
+        n = len(chunk) - len(chunk.lstrip())
+        start += n
+        if n < len(chunk):
+            break
+
+    end = size
+    while end > start:
+        pos = max(start, end - _STRIP_CHUNK)
+        f.seek(pos)
+        chunk = f.read(end - pos)
+        if not chunk:
+            break
+        n = len(chunk) - len(chunk.rstrip())
+        end -= n
+        if n < len(chunk):
+            break
+
+    return start, end
+
+
+def _copy_range(src, out, start: int, end: int) -> None:
+    """把 src 中 [start, end) 的字节原样写入 out，不做任何解码。"""
+    if _USE_SENDFILE:
+        out.flush()
+        offset, remaining = start, end - start
+        try:
+            while remaining > 0:
+                sent = os.sendfile(out.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            # sendfile 不经过 Python 的文件对象，需要同步写入位置
+            # （输出文件可能已预分配到更大的长度，不能直接跳到末尾）
+            out.seek(os.lseek(out.fileno(), 0, os.SEEK_CUR))
+            return
+        except OSError:
+            # 个别文件系统不支持，回退到普通拷贝（从尚未拷贝的位置继续）
+            start = offset
+
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(_COPY_CHUNK, remaining))
+        if not chunk:
+            break
+        out.write(chunk)
+        remaining -= len(chunk)
+
+
 # ── 合并逻辑 ──────────────────────────────────────────────────
 
 def merge(
@@ -76,9 +221,11 @@ def merge(
     sort_by: str = "date",
     separator: str = "---",
     title: str = "",
+    force: bool = False,
 ):
     """
     合并 source_dir 下所有 .md 文件到 output_file。
+    输出文件已存在且比所有来源文件都新时直接跳过（force=True 时总是重新合并）。
 
     Args:
         source_dir: 要扫描的根目录
@@ -86,19 +233,33 @@ def merge(
         sort_by: 排序方式，"date"（按日期）或 "name"（按文件名）
         separator: 文件间的分隔符
         title: 合并文件的总标题（为空则自动生成）
+        force: 忽略修改时间检查，强制重新合并
     """
     if not source_dir.exists():
         print(f"[ERR] 目录不存在: {source_dir}", file=sys.stderr)
         sys.exit(1)
 
-    files = collect_md_files(source_dir)
+    files, dirs = walk_sources(source_dir)
     if not files:
         print(f"[WARN] 目录中未找到任何 .md 文件: {source_dir}", file=sys.stderr)
         sys.exit(1)
 
+    # 来源没有任何变化时跳过，不读也不写任何文件内容
+    if not force and output_file.exists():
+        try:
+            up_to_date = output_file.stat().st_mtime >= newest_mtime(files, dirs)
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            print(f"[SKIP] 输出文件已是最新，无需重新合并: {output_file.resolve()}（使用 --force 强制合并）")
+            return
+
     # 排序
     if sort_by == "date":
-        files.sort(key=sort_key_by_date)
+        # 每个文件只扫描一次头部（多线程并行读取），结果缓存后再排序（日期相同时按路径排序）
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as ex:
+            date_cache: dict[Path, str] = dict(zip(files, ex.map(read_header_date, files)))
+        files.sort(key=lambda p: (date_cache[p], str(p)))
     else:
         files.sort(key=sort_key_by_name)
 
@@ -106,33 +267,49 @@ def merge(
     if not title:
         title = f"{source_dir.resolve().name} — 合并文档"
 
-    # 构建合并内容
-    parts: list[str] = [f"# {title}\n\n"]
-    parts.append(
+    # 分隔符与文件头预先编码为字节，正文按字节直接拷贝，省去 UTF-8 解码/编码
+    sep_block = f"\n\n{separator}\n\n".encode("utf-8")
+    header = (
+        f"# {title}\n\n"
         f"> 共 {len(files)} 篇，来源目录：`{source_dir.resolve()}`\n\n"
-    )
-    parts.append(f"{separator}\n\n")
-
-    sep_block = f"\n\n{separator}\n\n"
-
-    for i, md_file in enumerate(files):
-        try:
-            content = md_file.read_text(encoding="utf-8").strip()
-        except Exception as e:
-            print(f"[WARN] 读取失败，已跳过: {md_file}  ({e})", file=sys.stderr)
-            continue
-
-        # 把每个文件的内容追加进去
-        parts.append(content)
-
-        if i < len(files) - 1:
-            parts.append(sep_block)
-
-    merged = "".join(parts) + "\n"
+        f"{separator}\n\n"
+    ).encode("utf-8")
 
     # 确保输出目录存在
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text(merged, encoding="utf-8")
+
+    # 逐个文件流式写出，避免把全部内容同时堆在内存里。
+    # 先写入同目录下的临时文件，成功后再替换：中途出错（如磁盘空间不足）或被中断时
+    # 原来的合并结果保持不变，也不会留下一个比来源更新、导致之后一直 [SKIP] 的残缺文件
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    try:
+        with tmp_file.open("wb") as out:
+            if _USE_FALLOCATE:
+                _preallocate(out, files, len(header) + len(sep_block) * (len(files) - 1) + 1)
+
+            out.write(header)
+
+            for i, md_file in enumerate(files):
+                try:
+                    with md_file.open("rb") as src:
+                        start, end = _stripped_span(src, os.fstat(src.fileno()).st_size)
+                        # 把每个文件的内容追加进去
+                        _copy_range(src, out, start, end)
+                except Exception as e:
+                    print(f"[WARN] 读取失败，已跳过: {md_file}  ({e})", file=sys.stderr)
+                    continue
+
+                if i < len(files) - 1:
+                    out.write(sep_block)
+
+            out.write(b"\n")
+            # 去掉预分配但未用到的尾部空间
+            out.truncate()
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        # 包括 _preallocate 中的 sys.exit() 与 KeyboardInterrupt
+        tmp_file.unlink(missing_ok=True)
+        raise
 
     print(f"[OK] 合并完成：共 {len(files)} 个文件 -> {output_file.resolve()}")
 
@@ -159,6 +336,9 @@ def main():
 
   # 自定义总标题
   python merge_md.py output/heroblast/answers --title "我的知乎回答合集"
+
+  # 来源未变化时默认跳过，强制重新合并
+  python merge_md.py output/heroblast/answers --force
         """,
     )
     parser.add_argument(
@@ -190,6 +370,11 @@ def main():
         default="",
         help="合并文件的总标题（默认：自动生成）",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="即使输出文件比所有来源文件都新，也重新合并（更换排序/分隔符/标题后使用）",
+    )
 
     args = parser.parse_args()
 
@@ -207,6 +392,7 @@ def main():
         sort_by=args.sort_by,
         separator=args.separator,
         title=args.title,
+        force=args.force,
     )
 
 
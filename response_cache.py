@@ -0,0 +1,69 @@
+"""
+response_cache.py — API 响应的本地磁盘缓存
+
+以「登录身份 + URL」的哈希为键，把响应保存为 .cache/http/ 下的 JSON 文件；
+在有效期（TTL）内重复请求同一地址时直接读盘，跳过网络往返与限速等待。
+
+用于反复运行的诊断脚本（debug_comments.py），以及 `main.py answer --with-comments --cache`。
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".cache" / "http"
+
+# 默认缓存有效期（秒）
+DEFAULT_TTL = 3600
+
+
+class ResponseCache:
+    """
+    简单的磁盘响应缓存，值为任意可 JSON 序列化的对象。
+
+    identity 用于区分登录身份（如知乎的 z_c0 Cookie），只以哈希形式参与缓存键，
+    不同账号看到的评论数据不会互相串用。
+    """
+
+    def __init__(
+        self,
+        base_dir: Path = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        identity: str = "",
+    ):
+        self.base_dir = base_dir
+        self.ttl = ttl
+        self._identity = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(f"{self._identity}\n{url}".encode("utf-8")).hexdigest()
+        return self.base_dir / key[:2] / f"{key}.json"
+
+    def get(self, url: str):
+        """返回缓存的响应；不存在、已过期或损坏时返回 None。"""
+        try:
+            entry = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry.get("response")
+
+    def set(self, url: str, response) -> None:
+        """写入缓存（先写临时文件再替换，避免中断时留下半个文件）。"""
+        path = self._path(url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(
+                    {"url": url, "fetched_at": time.time(), "response": response},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp, path)
+        except OSError:
+            pass
@@ -12,21 +12,34 @@ scraper.py — 知乎内容爬虫核心模块
 8. 请求间隔随机延迟，降低被封风险
 """
 
+from __future__ import annotations
+
 import asyncio
 import hashlib
+import io
 import json
+import os
 import random
 import re
+import shutil
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import date as dt_date, datetime
+from itertools import chain
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
-import httpx
-from playwright.async_api import async_playwright, Page, BrowserContext
-
 from stealth import STEALTH_JS
-from converter import ZhihuConverter
+from response_cache import ResponseCache
+
+# httpx / Playwright / converter（bs4 + markdownify）导入较慢，只在真正用到的函数里按需导入，
+# 这样 main.py 读取 TokenBucket、解析 URL 等轻量操作时无需加载它们
+if TYPE_CHECKING:
+    import httpx
+    from playwright.async_api import BrowserContext, Page, Playwright
 
 # ── 配置 ─────────────────────────────────────────────────────
 
@@ -44,40 +57,150 @@ IMG_HEADERS = {
     "User-Agent": USER_AGENT,
 }
 
-# 每次请求之间的延迟范围（秒）
-MIN_DELAY = 5
-MAX_DELAY = 10
+# 共享 HTTP 客户端的连接池配置
+HTTP_MAX_KEEPALIVE = 20
+HTTP_MAX_CONNECTIONS = 50
+HTTP_TIMEOUT = 20.0
+# 空闲连接保留时间（秒）：httpx 默认只有 5 秒，短于两篇内容之间的请求间隔，
+# 会导致每篇的图片下载都重新握手
+HTTP_KEEPALIVE_EXPIRY = 30.0
+
+# 单篇内容中同时下载的图片数（不超过连接池上限）
+IMG_CONCURRENCY = 10
+
+# 爬取用户内容 / 问题回答 / 想法时同时打开的页面数
+MAX_PARALLEL_PAGES = 3
+
+# 自适应限速：触发反爬后请求间隔翻倍（最多放慢到原来的 BACKOFF_MAX 倍），
+# 之后每次成功缩短为 BACKOFF_RECOVER 倍；连续 BACKOFF_FAIL_LIMIT 次触发反爬则整体暂停 BACKOFF_PAUSE 秒
+BACKOFF_MAX = 4.0
+BACKOFF_RECOVER = 0.9
+BACKOFF_FAIL_LIMIT = 3
+BACKOFF_PAUSE = 60.0
+
+# 问题的回答列表（links.json）在这段时间内可直接复用，重新运行时跳过滚动收集（秒）
+LINKS_MAX_AGE = 24 * 3600
+
+# 文件头部元信息（标题/类型/作者/来源）所在的字节范围：
+# 原先按 500 个字符截取，按 UTF-8 中文最多约 1500 字节
+_HEAD_BYTES = 2048
+
+# 启动时扫描已保存文件所用的线程数
+DISK_SCAN_WORKERS = 32
+
+# 内容类型的中文名（文件元信息头与爬取进度输出共用）
+_TYPE_LABELS = {"answer": "回答", "article": "文章", "pin": "想法"}
+
+# 预编译的正则（在大量标题 / 文件上反复调用）
+_FNAME_BAD = re.compile(r'[/\\:*?"<>|\x00-\x1f]')
+_QID_RE = re.compile(r'question/(\d+)')
+_ANS_RE = re.compile(r'question/(\d+)/answer/(\d+)')
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_URL_META_RE = re.compile(r'>\s*\*\*来源\*\*:\s*\[([^\]]+)\]')
 
 
 # ── 工具函数 ──────────────────────────────────────────────────
 
 def sanitize_filename(name: str) -> str:
     """清理文件名中不允许的字符。"""
-    name = re.sub(r'[/\\:*?"<>|\x00-\x1f]', "_", name)
+    # 绝大多数标题本身就是合法文件名，检查通过时直接返回，省去替换与裁剪
+    if len(name) <= 120 and name == name.strip(" .") and not _FNAME_BAD.search(name):
+        return name or "untitled"
+    name = _FNAME_BAD.sub("_", name)
     name = name.strip(" .")
     if len(name) > 120:
         name = name[:120].rstrip(" .")
     return name or "untitled"
 
 
-def random_delay():
-    """返回一个随机延迟时间。"""
-    return MIN_DELAY + random.random() * (MAX_DELAY - MIN_DELAY)
+class TokenBucket:
+    """
+    令牌桶限速器：平均每秒发放 rate 个令牌，空闲时最多累积 burst 个。
 
+    与"每次请求后固定 sleep"不同，请求本身花费的时间会计入间隔：
+    总体请求速率不变，但慢请求之后不会再额外等待一整个间隔。
+    每次请求消耗的令牌数在 cost_range 内随机，用来保留请求间隔的随机性。
 
-def _nested_get(d: dict, *keys):
-    """安全地从嵌套字典中获取值。"""
-    for key in keys:
-        if isinstance(d, dict):
-            d = d.get(key, {})
-        else:
-            return None
-    return d if d != {} else None
+    同时带有自适应退避：report_blocked() 会放慢发放速率，report_success() 逐步恢复，
+    连续多次被拦截时暂停发放一段时间。所有页面共享同一个实例，退避对它们同时生效。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        cost_range: tuple[float, float] = (1.0, 1.0),
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate 必须大于 0: {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.cost_range = cost_range
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        # 当前的放慢倍数（1 表示按原速率）、连续被拦截次数、暂停截止时间
+        self._backoff = 1.0
+        self._fails = 0
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_delay(cls, delay_min: float, delay_max: float, burst: int = 1) -> "TokenBucket":
+        """
+        按 --delay-min / --delay-max 构造：平均间隔为两者的均值，
+        单次间隔仍随机落在 [delay_min, delay_max] 内。
+        """
+        delay_min, delay_max = sorted((max(0.0, delay_min), max(0.0, delay_max)))
+        mean = (delay_min + delay_max) / 2
+        if mean == 0:
+            return cls(float("inf"), burst)
+        return cls(1 / mean, burst, (delay_min / mean, delay_max / mean))
+
+    def reserve(self) -> float:
+        """预订一个请求名额，返回需要等待的秒数（0 表示可以立即发出）。"""
+        now = time.monotonic()
+        pause = max(0.0, self._paused_until - now)
+        if self.rate == float("inf"):
+            return pause
+        rate = self.rate / self._backoff
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        self._tokens -= random.uniform(*self.cost_range)
+        return pause + max(0.0, -self._tokens / rate)
+
+    def report_success(self) -> None:
+        """请求成功：逐步恢复到原速率。"""
+        self._backoff = max(1.0, self._backoff * BACKOFF_RECOVER)
+        self._fails = 0
+
+    def report_blocked(self) -> float:
+        """
+        请求被拦截（403/429/40362 等）：请求间隔翻倍。
+        连续达到 BACKOFF_FAIL_LIMIT 次时暂停发放，返回暂停的秒数（未暂停返回 0）。
+        """
+        self._backoff = min(BACKOFF_MAX, self._backoff * 2)
+        self._fails += 1
+        if self._fails < BACKOFF_FAIL_LIMIT:
+            return 0.0
+        self._fails = 0
+        self._paused_until = time.monotonic() + BACKOFF_PAUSE
+        return BACKOFF_PAUSE
+
+    @property
+    def backoff(self) -> float:
+        """当前的放慢倍数。"""
+        return self._backoff
+
+    async def acquire(self) -> float:
+        """等待直到可以发出下一个请求，返回实际等待的秒数。"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
 
 
 def parse_question_id(input_str: str) -> str:
     """从 URL 或纯数字中提取问题 ID。"""
-    match = re.search(r'question/(\d+)', input_str)
+    match = _QID_RE.search(input_str)
     if match:
         return match.group(1)
     if input_str.strip().isdigit():
@@ -93,7 +216,7 @@ def parse_answer_url(input_str: str) -> tuple[str, str, str]:
         https://www.zhihu.com/question/12345/answer/67890
         /question/12345/answer/67890
     """
-    match = re.search(r'question/(\d+)/answer/(\d+)', input_str)
+    match = _ANS_RE.search(input_str)
     if match:
         qid, aid = match.group(1), match.group(2)
         full_url = f"https://www.zhihu.com/question/{qid}/answer/{aid}"
@@ -101,8 +224,114 @@ def parse_answer_url(input_str: str) -> tuple[str, str, str]:
     raise ValueError(f"无法识别回答 URL: {input_str}")
 
 
+# ── 事件循环 ─────────────────────────────────────────────────
+
+def _event_loop_factory():
+    """
+    按环境变量 ZHIZHU_EVENT_LOOP 选择事件循环实现，返回 loop 工厂函数；None 表示使用默认循环。
+
+        未设置 / uvloop  已安装 uvloop 时使用它，否则使用默认循环
+        uring           使用 uringcore（io_uring，需 Linux 5.11+），未安装时退回 uvloop / 默认循环
+        asyncio         强制使用默认循环
+
+    Windows 上始终使用默认循环。
+    """
+    choice = os.environ.get("ZHIZHU_EVENT_LOOP", "").strip().lower()
+    if sys.platform == "win32" or choice == "asyncio":
+        return None
+    if choice == "uring":
+        try:
+            import uringcore
+            return uringcore.EventLoopPolicy().new_event_loop
+        except Exception:
+            pass
+    try:
+        import uvloop
+        return uvloop.new_event_loop
+    except ImportError:
+        return None
+
+
+def run_async(coro):
+    """
+    运行协程直到结束（代替 asyncio.run），按 _event_loop_factory() 选择事件循环。
+
+    只为本次运行创建循环，不修改全局事件循环策略，因此也可以在 TUI / WebUI 的工作线程中调用。
+    Python 3.10 没有 asyncio.Runner，始终使用默认循环。
+    """
+    factory = _event_loop_factory() if sys.version_info >= (3, 11) else None
+    if factory is None:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        return runner.run(coro)
+
+
+# ── HTTP 客户端 ──────────────────────────────────────────────
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    创建共享的 HTTP 客户端：HTTP/2 + keep-alive 连接池。
+    一次爬取中的所有图片请求复用同一组连接，避免重复握手。
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=True,
+        headers=IMG_HEADERS,
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            max_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def create_api_client(cookies: dict[str, str], referer: str) -> httpx.AsyncClient:
+    """
+    创建调用知乎 API 的 HTTP 客户端，携带从浏览器导出的登录 Cookie。
+
+    与图片客户端分开：登录 Cookie 只发给知乎 API，不会带到图片 CDN。
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=True,
+        cookies=cookies,
+        headers={"User-Agent": USER_AGENT, "Referer": referer},
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            max_connections=HTTP_MAX_CONNECTIONS,
+        ),
+    )
+
+
+@asynccontextmanager
+async def _http_client_scope(client: httpx.AsyncClient | None):
+    """使用调用方传入的客户端；未传入时临时创建一个，并在结束时关闭。"""
+    if client is not None:
+        yield client
+        return
+    async with create_http_client() as own_client:
+        yield own_client
+
+
 # ── 浏览器上下文管理 ─────────────────────────────────────────
 
+@asynccontextmanager
+async def _playwright_scope(pw: Playwright | None):
+    """使用调用方传入的 Playwright 实例；未传入时临时启动一个，并在结束时停止。"""
+    if pw is not None:
+        yield pw
+        return
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as own_pw:
+        yield own_pw
+
+
 async def create_browser_context(pw, headless=False) -> BrowserContext:
     """创建带有反检测的持久化浏览器上下文。"""
     USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -120,17 +349,29 @@ async def create_browser_context(pw, headless=False) -> BrowserContext:
         f"--window-size={width},{height}",
     ]
 
-    context = await pw.chromium.launch_persistent_context(
-        user_data_dir=str(USER_DATA_DIR),
-        headless=headless,
-        slow_mo=50,
-        args=launch_args,
-        viewport={"width": width, "height": height},
-        user_agent=USER_AGENT,
-        locale="zh-CN",
-        timezone_id="Asia/Shanghai",
-        java_script_enabled=True,
-    )
+    try:
+        context = await pw.chromium.launch_persistent_context(
+            user_data_dir=str(USER_DATA_DIR),
+            headless=headless,
+            slow_mo=50,
+            args=launch_args,
+            viewport={"width": width, "height": height},
+            user_agent=USER_AGENT,
+            locale="zh-CN",
+            timezone_id="Asia/Shanghai",
+            java_script_enabled=True,
+        )
+    except Exception as e:
+        # 诊断脚本（browser_session.py）的常驻浏览器会一直占用 browser_data；
+        # 只有确认它仍在运行时才这样提示，残留的 .cdp 文件不算
+        from browser_session import daemon_running
+
+        if daemon_running():
+            raise RuntimeError(
+                "浏览器启动失败：browser_data 正被诊断脚本的常驻浏览器占用，"
+                "请先运行 python browser_session.py --stop 关闭它"
+            ) from e
+        raise
 
     # 注入反检测脚本
     await context.add_init_script(STEALTH_JS)
@@ -140,13 +381,14 @@ async def create_browser_context(pw, headless=False) -> BrowserContext:
 
 # ── 登录 ─────────────────────────────────────────────────────
 
-async def login(timeout: int = 300):
+async def login(timeout: int = 300, playwright: Playwright | None = None):
     """
     打开知乎登录页面，等待用户手动登录。
     登录状态会保存在 browser_data 目录中，后续爬取无需重复登录。
 
     Args:
         timeout: 等待登录的超时时间（秒），默认 300 秒
+        playwright: 共享的 Playwright 实例（可选，不传则内部启动一个）
     """
     print("=" * 60)
     print("🔐 知乎登录")
@@ -154,7 +396,7 @@ async def login(timeout: int = 300):
     print(f"将打开浏览器，请在 {timeout} 秒内完成登录。")
     print("登录成功后，程序会自动检测并保存登录状态。\n")
 
-    async with async_playwright() as pw:
+    async with _playwright_scope(playwright) as pw:
         context = await create_browser_context(pw, headless=False)
         try:
             page = context.pages[0] if context.pages else await context.new_page()
@@ -184,6 +426,28 @@ async def login(timeout: int = 300):
 
 # ── 收集用户回答/文章列表 ────────────────────────────────────
 
+# 在浏览器内一次性取出所有匹配元素的链接。a.href 是浏览器解析后的绝对地址，
+# 无需在 Python 侧再处理 "//"、"/" 等相对格式
+COLLECT_HREFS_JS = "(sel) => Array.from(document.querySelectorAll(sel), a => a.href).filter(Boolean)"
+
+# 每次滚动的全部页面操作合并为一次 evaluate：先读取"到底"标识和当前页面高度，
+# 再滚到底部并额外下移 dist 像素（直接操作 documentElement.scrollTop 才能触发知乎的懒加载）。
+# "到底"提示渲染在列表末尾的卡片 / 哨兵节点中，只检查这一个节点开头的少量文字，
+# 不再为整页生成 innerText（找不到该节点时由"高度不再变化"的条件兜底结束滚动）
+SCROLL_STEP_JS = """(dist) => {
+    const tail = document.querySelector('.List-sentinel')
+        || document.querySelector('.List .Card:last-child, .List > :last-child');
+    const text = tail ? tail.textContent.slice(0, 64) : '';
+    const state = {
+        end: text.includes('已显示全部') || text.includes('没有更多了'),
+        h: document.body.scrollHeight,
+    };
+    const root = document.documentElement;
+    window.scrollTo(0, root.scrollHeight);
+    root.scrollTop += dist;
+    return state;
+}"""
+
 async def _scroll_and_collect_links(
     page: Page, base_url: str, css_selector: str, url_filter_keywords: list[str]
 ) -> list[str]:
@@ -214,21 +478,12 @@ async def _scroll_and_collect_links(
     prev_scroll_height = 0
 
     while no_new_count < max_no_new:
-        # 使用 CSS 选择器提取链接（比 JS 正则更可靠）
-        link_elements = await page.query_selector_all(css_selector)
-        links = []
-        for el in link_elements:
-            href = await el.get_attribute("href")
-            if href:
-                # 处理不同格式的 URL
-                if href.startswith("//"):
-                    href = "https:" + href
-                elif href.startswith("/"):
-                    href = "https://www.zhihu.com" + href
-                elif not href.startswith("http"):
-                    href = "https://www.zhihu.com/" + href
-                if any(kw in href for kw in url_filter_keywords):
-                    links.append(href.split("?")[0])
+        # 使用 CSS 选择器提取链接（比 JS 正则更可靠），一次 evaluate 取回全部 href
+        hrefs = await page.evaluate(COLLECT_HREFS_JS, css_selector)
+        links = [
+            href.split("?")[0] for href in hrefs
+            if any(kw in href for kw in url_filter_keywords)
+        ]
 
         prev_count = len(collected_links)
         collected_links.update(links)
@@ -243,18 +498,17 @@ async def _scroll_and_collect_links(
         print(f"   📜 第 {scroll_count} 次滚动，已发现 {len(collected_links)} 个链接"
               + (f"（新增 {new_count}）" if new_count > 0 else "（无新增）"))
 
-        # 检查页面是否包含明确的"到底"标识
-        end_marker = await page.evaluate("""() => {
-            const bodyText = document.body.innerText;
-            return bodyText.includes('已显示全部') || bodyText.includes('没有更多了');
-        }""")
+        # 读取"到底"标识与页面高度，并在同一次 evaluate 中完成滚动
+        scroll_distance = random.randint(800, 1500)
+        state = await page.evaluate(SCROLL_STEP_JS, scroll_distance)
 
-        if end_marker and no_new_count >= 3:
+        # 检查页面是否包含明确的"到底"标识
+        if state["end"] and no_new_count >= 3:
             print("   📋 已到达列表底部（页面提示已显示全部）。")
             break
 
         # 检查页面高度是否还在增长（懒加载是否还在工作）
-        current_scroll_height = await page.evaluate("document.body.scrollHeight")
+        current_scroll_height = state["h"]
         height_changed = current_scroll_height != prev_scroll_height
         prev_scroll_height = current_scroll_height
 
@@ -263,14 +517,8 @@ async def _scroll_and_collect_links(
             print("   📋 页面不再加载新内容，停止滚动。")
             break
 
-        # 滚动 — 使用多种方式触发知乎的懒加载
         # window.scrollBy 无法触发知乎的 scroll 事件监听器，
-        # 必须使用键盘 End 键或直接操作 documentElement.scrollTop
-        scroll_distance = random.randint(800, 1500)
-        await page.keyboard.press("End")
-        await asyncio.sleep(0.5)
-        await page.evaluate(f"document.documentElement.scrollTop += {scroll_distance}")
-        await asyncio.sleep(0.3)
+        # 上面直接操作了 documentElement.scrollTop，再补一次键盘 End 键
         await page.keyboard.press("End")
 
         # 等待新内容加载
@@ -327,6 +575,7 @@ async def collect_question_answer_links(
     # 关闭可能的登录弹窗
     await _dismiss_popup(page)
 
+    answer_path = f"/question/{question_id}/answer/"
     collected_links = set()
     no_new_count = 0
     max_no_new = 10
@@ -334,20 +583,9 @@ async def collect_question_answer_links(
     prev_scroll_height = 0
 
     while no_new_count < max_no_new:
-        # 使用 CSS 选择器提取回答链接
-        link_elements = await page.query_selector_all('a[href*="/answer/"]')
-        links = []
-        for el in link_elements:
-            href = await el.get_attribute("href")
-            if href:
-                if href.startswith("//"):
-                    href = "https:" + href
-                elif href.startswith("/"):
-                    href = "https://www.zhihu.com" + href
-                elif not href.startswith("http"):
-                    href = "https://www.zhihu.com/" + href
-                if f"/question/{question_id}/answer/" in href:
-                    links.append(href.split("?")[0])
+        # 使用 CSS 选择器提取回答链接，一次 evaluate 取回全部 href
+        hrefs = await page.evaluate(COLLECT_HREFS_JS, 'a[href*="/answer/"]')
+        links = [href.split("?")[0] for href in hrefs if answer_path in href]
 
         prev_count = len(collected_links)
         collected_links.update(links)
@@ -367,18 +605,17 @@ async def collect_question_answer_links(
             print(f"   📋 已达到目标数量 {max_answers}。")
             break
 
-        # 检查页面是否包含明确的"到底"标识
-        end_marker = await page.evaluate("""() => {
-            const bodyText = document.body.innerText;
-            return bodyText.includes('已显示全部') || bodyText.includes('没有更多了');
-        }""")
+        # 读取"到底"标识与页面高度，并在同一次 evaluate 中完成滚动
+        scroll_distance = random.randint(800, 1500)
+        state = await page.evaluate(SCROLL_STEP_JS, scroll_distance)
 
-        if end_marker and no_new_count >= 3:
+        # 检查页面是否包含明确的"到底"标识
+        if state["end"] and no_new_count >= 3:
             print("   📋 已到达列表底部（页面提示已显示全部）。")
             break
 
         # 检查页面高度是否还在增长
-        current_scroll_height = await page.evaluate("document.body.scrollHeight")
+        current_scroll_height = state["h"]
         height_changed = current_scroll_height != prev_scroll_height
         prev_scroll_height = current_scroll_height
 
@@ -386,12 +623,6 @@ async def collect_question_answer_links(
             print("   📋 页面不再加载新内容，停止滚动。")
             break
 
-        # 滚动 — 使用多种方式触发知乎的懒加载
-        scroll_distance = random.randint(800, 1500)
-        await page.keyboard.press("End")
-        await asyncio.sleep(0.5)
-        await page.evaluate(f"document.documentElement.scrollTop += {scroll_distance}")
-        await asyncio.sleep(0.3)
         await page.keyboard.press("End")
 
         await asyncio.sleep(2.0 + random.random() * 2)
@@ -417,6 +648,30 @@ async def _dismiss_popup(page: Page) -> None:
         pass
 
 
+# 在浏览器内检查反爬标识，只回传一个布尔值，而不是把整页正文传回 Python。
+# 知乎也可能以 200 状态返回页面、再由前端渲染"请求存在异常"，所以状态码正常时仍需检查
+ANTI_BOT_CHECK_JS = """() => {
+    const text = document.body.innerText;
+    return text.includes('40362') || text.includes('请求存在异常');
+}"""
+
+
+# 知乎拦截请求时返回的文档状态码
+ANTI_BOT_STATUS = frozenset({403, 429})
+
+
+def _check_response_status(resp, url: str) -> None:
+    """页面文档本身返回拦截状态码时抛出异常（与 _check_anti_bot 的异常信息一致，便于统一退避）。"""
+    if resp is not None and resp.status in ANTI_BOT_STATUS:
+        raise Exception(f"触发知乎反爬 (HTTP {resp.status}): {url}")
+
+
+async def _check_anti_bot(page: Page, url: str) -> None:
+    """页面为知乎反爬提示时抛出异常。"""
+    if await page.evaluate(ANTI_BOT_CHECK_JS):
+        raise Exception(f"触发知乎反爬 (40362): {url}")
+
+
 async def _safe_text(page: Page, selector: str, default: str) -> str:
     """安全获取元素文本。"""
     try:
@@ -441,7 +696,7 @@ async def _extract_date(page: Page) -> str:
         date_text = await _safe_text(page, ".ContentItem-time", "")
         if not date_text:
             date_text = await _safe_text(page, ".Post-Header .ContentItem-time", "")
-        match = re.search(r"(\d{4}-\d{2}-\d{2})", date_text)
+        match = _DATE_RE.search(date_text)
         if match:
             return match.group(1)
     except Exception:
@@ -449,6 +704,62 @@ async def _extract_date(page: Page) -> str:
     return dt_date.today().isoformat()
 
 
+# 回答/文章页的元信息与正文 HTML 在浏览器内一次取完，省去逐个 locator 的往返。
+# text() / html() 依次尝试多个选择器，取第一个有内容的元素；
+# datePublished 只在页面上恰好有一个时采用（与严格模式的 locator 行为一致），否则回退到页面上的时间文本
+_EXTRACT_HELPERS_JS = """
+    const text = (...sels) => {
+        for (const sel of sels) {
+            const el = document.querySelector(sel);
+            if (el && el.innerText) return el.innerText;
+        }
+        return '';
+    };
+    const html = (...sels) => {
+        for (const sel of sels) {
+            const el = document.querySelector(sel);
+            if (el) return el.innerHTML;
+        }
+        return document.body.innerHTML;
+    };
+    const metas = document.querySelectorAll('meta[itemprop="datePublished"]');
+    const datePublished = metas.length === 1 ? (metas[0].getAttribute('content') || '') : '';
+    const dateText = text('.ContentItem-time', '.Post-Header .ContentItem-time');
+"""
+
+EXTRACT_ANSWER_JS = "() => {" + _EXTRACT_HELPERS_JS + """
+    return {
+        title: text('h1.QuestionHeader-title'),
+        author: text('.AuthorInfo-name .UserLink-link', '.AuthorInfo span.UserLink-Name'),
+        datePublished,
+        dateText,
+        html: html('.QuestionAnswer-content .RichText', '.RichText'),
+    };
+}"""
+
+EXTRACT_ARTICLE_JS = "() => {" + _EXTRACT_HELPERS_JS + """
+    const titleImage = document.querySelector('img.TitleImage');
+    return {
+        title: text('h1.Post-Title'),
+        author: text('.AuthorInfo span.UserLink-Name', '.AuthorInfo-name .UserLink-link'),
+        datePublished,
+        dateText,
+        html: html('.Post-RichTextContainer .RichText', '.RichText'),
+        titleImage: titleImage ? (titleImage.getAttribute('src') || '') : '',
+    };
+}"""
+
+
+def _pick_date(date_published: str, date_text: str) -> str:
+    """按 meta 日期 → 页面时间文本 → 今天 的顺序确定发布日期。"""
+    if date_published:
+        return date_published[:10]
+    match = _DATE_RE.search(date_text)
+    if match:
+        return match.group(1)
+    return dt_date.today().isoformat()
+
+
 async def extract_answer(page: Page, url: str) -> dict:
     """
     提取知乎回答内容。
@@ -456,14 +767,14 @@ async def extract_answer(page: Page, url: str) -> dict:
     Returns:
         {"title": str, "author": str, "html": str, "date": str, "type": "answer", "url": str}
     """
-    await page.goto(url, wait_until="domcontentloaded")
+    resp = await page.goto(url, wait_until="domcontentloaded")
+    # 被拦截时文档本身就是错误状态码，直接失败，不必再等页面渲染
+    _check_response_status(resp, url)
     await page.wait_for_timeout(3000)
     await _dismiss_popup(page)
 
     # 检查反爬
-    text = await page.locator("body").inner_text()
-    if "40362" in text or "请求存在异常" in text:
-        raise Exception(f"触发知乎反爬 (40362): {url}")
+    await _check_anti_bot(page, url)
 
     # 等待内容加载
     try:
@@ -481,27 +792,14 @@ async def extract_answer(page: Page, url: str) -> dict:
     except Exception:
         pass
 
-    title = await _safe_text(page, "h1.QuestionHeader-title", "未知问题")
-    author = await _safe_text(page, ".AuthorInfo-name .UserLink-link", "未知作者")
-    if author == "未知作者":
-        author = await _safe_text(page, ".AuthorInfo span.UserLink-Name", "未知作者")
-    date = await _extract_date(page)
-
-    # 提取回答 HTML
-    html = ""
-    try:
-        html = await page.locator(".QuestionAnswer-content .RichText").first.inner_html()
-    except Exception:
-        try:
-            html = await page.locator(".RichText").first.inner_html()
-        except Exception:
-            html = await page.locator("body").inner_html()
+    # 标题、作者、日期与回答 HTML 一次取回
+    data = await page.evaluate(EXTRACT_ANSWER_JS)
 
     return {
-        "title": title.strip(),
-        "author": author.strip(),
-        "html": html,
-        "date": date,
+        "title": data["title"].strip() or "未知问题",
+        "author": data["author"].strip() or "未知作者",
+        "html": data["html"],
+        "date": _pick_date(data["datePublished"], data["dateText"]),
         "type": "answer",
         "url": url,
     }
@@ -514,50 +812,32 @@ async def extract_article(page: Page, url: str) -> dict:
     Returns:
         {"title": str, "author": str, "html": str, "date": str, "type": "article", "url": str}
     """
-    await page.goto(url, wait_until="domcontentloaded")
+    resp = await page.goto(url, wait_until="domcontentloaded")
+    # 被拦截时文档本身就是错误状态码，直接失败，不必再等页面渲染
+    _check_response_status(resp, url)
     await page.wait_for_timeout(3000)
     await _dismiss_popup(page)
 
-    text = await page.locator("body").inner_text()
-    if "40362" in text or "请求存在异常" in text:
-        raise Exception(f"触发知乎反爬 (40362): {url}")
+    await _check_anti_bot(page, url)
 
     try:
         await page.wait_for_selector("h1.Post-Title", timeout=15000)
     except Exception:
         await page.wait_for_selector(".RichText", timeout=10000)
 
-    title = await _safe_text(page, "h1.Post-Title", "未知标题")
-    author = await _safe_text(page, ".AuthorInfo span.UserLink-Name", "未知作者")
-    if author == "未知作者":
-        author = await _safe_text(page, ".AuthorInfo-name .UserLink-link", "未知作者")
-    date = await _extract_date(page)
-
-    html = ""
-    try:
-        rich = page.locator(".Post-RichTextContainer .RichText").first
-        if await rich.count() > 0:
-            html = await rich.inner_html()
-        else:
-            html = await page.locator(".RichText").first.inner_html()
-    except Exception:
-        html = await page.locator("body").inner_html()
+    # 标题、作者、日期、正文 HTML 与头图一次取回
+    data = await page.evaluate(EXTRACT_ARTICLE_JS)
 
-    # 尝试获取头图
-    try:
-        title_img = page.locator("img.TitleImage").first
-        if await title_img.count() > 0:
-            src = await title_img.get_attribute("src")
-            if src:
-                html = f'<img src="{src}" alt="TitleImage"><br>{html}'
-    except Exception:
-        pass
+    html = data["html"]
+    # 有头图时放在正文最前面
+    if data["titleImage"]:
+        html = f'<img src="{data["titleImage"]}" alt="TitleImage"><br>{html}'
 
     return {
-        "title": title.strip(),
-        "author": author.strip(),
+        "title": data["title"].strip() or "未知标题",
+        "author": data["author"].strip() or "未知作者",
         "html": html,
-        "date": date,
+        "date": _pick_date(data["datePublished"], data["dateText"]),
         "type": "article",
         "url": url,
     }
@@ -570,14 +850,14 @@ async def extract_pin(page: Page, url: str) -> dict:
     Returns:
         {"title": str, "author": str, "html": str, "date": str, "type": "pin", "url": str}
     """
-    await page.goto(url, wait_until="domcontentloaded")
+    resp = await page.goto(url, wait_until="domcontentloaded")
+    # 被拦截时文档本身就是错误状态码，直接失败，不必再等页面渲染
+    _check_response_status(resp, url)
     await page.wait_for_timeout(3000)
     await _dismiss_popup(page)
 
     # 检查反爬
-    text = await page.locator("body").inner_text()
-    if "40362" in text or "请求存在异常" in text:
-        raise Exception(f"触发知乎反爬 (40362): {url}")
+    await _check_anti_bot(page, url)
 
     # 等待内容加载
     try:
@@ -640,46 +920,100 @@ async def extract_pin(page: Page, url: str) -> dict:
 
 # ── 评论提取 ─────────────────────────────────────────────────
 
-async def _fetch_comment_page(page: Page, url: str) -> dict:
-    """通过浏览器 fetch 获取一页评论数据。"""
-    return await page.evaluate("""
-        async (url) => {
-            try {
-                const resp = await fetch(url, { credentials: 'include' });
-                if (!resp.ok) return { data: [], paging: { is_end: true } };
-                return await resp.json();
-            } catch (e) {
-                return { data: [], paging: { is_end: true } };
+# 请求失败时返回的空结果，调用方据此停止翻页
+_EMPTY_COMMENT_PAGE = {"data": [], "paging": {"is_end": True}}
+
+
+async def _fetch_comment_page(
+    client: httpx.AsyncClient, url: str, cache: ResponseCache | None = None
+) -> dict:
+    """
+    直接用 HTTP 客户端获取一页评论数据（不经过浏览器），传入 cache 时优先读取本地缓存。
+    """
+    if cache is not None:
+        hit = cache.get(url)
+        if hit is not None:
+            return hit
+
+    try:
+        resp = await client.get(url)
+        if resp.status_code != 200:
+            return _EMPTY_COMMENT_PAGE
+        data = resp.json()
+    except Exception:
+        return _EMPTY_COMMENT_PAGE
+
+    # 只缓存成功取到数据的页面，失败时返回的空结果不写入
+    if cache is not None and data.get("data"):
+        cache.set(url, data)
+    return data
+
+
+def _user_name(user: dict | None, default: str = "匿名用户") -> str:
+    """从评论中的用户结构提取名字。comment_v5 API 为 {name: ...}，旧版为 {member: {name: ...}}。"""
+    if not user:
+        return default
+    return user.get("name") or (user.get("member") or {}).get("name") or default
+
+
+async def _fetch_child_comments(
+    client: httpx.AsyncClient, comment_id: str, sem: asyncio.Semaphore,
+    cache: ResponseCache | None = None,
+) -> list[dict]:
+    """
+    获取一条根评论下的全部子评论（游标分页，必须顺序翻页）。
+
+    多条根评论的子评论可以并发获取，sem 限制同时在途的请求数。
+    """
+    children: list[dict] = []
+    next_url = (
+        f"https://www.zhihu.com/api/v4/comment_v5/comment/{comment_id}"
+        f"/child_comment?order_by=ts&limit=20&offset="
+    )
+    while next_url:
+        async with sem:
+            child_data = await _fetch_comment_page(client, next_url, cache)
+
+        if not child_data.get("data"):
+            break
+
+        children.extend([
+            {
+                "author": _user_name(child.get("author")),
+                "content": child.get("content", ""),
+                "created_time": child.get("created_time", 0),
+                "like_count": child.get("like_count", 0),
+                "reply_to": _user_name(child.get("reply_to_author"), ""),
             }
-        }
-    """, url)
+            for child in child_data["data"]
+        ])
 
+        child_paging = child_data.get("paging", {})
+        if child_paging.get("is_end", True):
+            break
+        next_url = child_paging.get("next", "")
+        await asyncio.sleep(0.3)
 
-def _get_comment_author(comment: dict) -> str:
-    """从评论数据中提取作者名。comment_v5 API 的 author 结构为 {name: ...}，无 member 层。"""
-    author = comment.get("author")
-    if isinstance(author, dict):
-        # comment_v5: author.name 直接可用
-        name = author.get("name")
-        if name:
-            return name
-        # 兼容旧版: author.member.name
-        member = author.get("member")
-        if isinstance(member, dict):
-            return member.get("name", "匿名用户")
-    return "匿名用户"
+    return children
 
 
-async def extract_comments(page: Page, answer_id: str) -> list[dict]:
+async def extract_comments(
+    client: httpx.AsyncClient, answer_id: str, concurrency: int = 4,
+    cache: ResponseCache | None = None,
+) -> list[dict]:
     """
     通过知乎 API 提取回答下的所有评论（包含子评论）。
 
     comment_v5 API 使用游标分页（cursor-based pagination），
     必须使用 paging.next 中的完整 URL 进行翻页，而非简单的整数 offset。
+    因此根评论只能逐页获取，但拿到游标后会立即预取下一页，与本页子评论的获取重叠；
+    同一页中各条根评论的子评论互不依赖，会并发获取。
 
     Args:
-        page: Playwright 页面对象（必须在知乎域名下）
+        client: 携带知乎登录 Cookie 的 HTTP 客户端（见 create_api_client）
         answer_id: 回答 ID
+        concurrency: 同时在途的子评论请求数上限
+        cache: 响应缓存（可选，命中时跳过网络请求）
 
     Returns:
         评论列表，每个评论包含 author, content, created_time, like_count, child_comments
@@ -687,73 +1021,64 @@ async def extract_comments(page: Page, answer_id: str) -> list[dict]:
     print(f"   💬 正在获取评论...")
 
     all_comments = []
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_root_page(url: str, delay: float) -> dict:
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await _fetch_comment_page(client, url, cache)
 
     # 首次请求：offset 留空，API 会返回第一页
-    next_url = (
+    next_task: asyncio.Task | None = asyncio.create_task(fetch_root_page(
         f"https://www.zhihu.com/api/v4/comment_v5/answers/{answer_id}"
-        f"/root_comment?order_by=score&limit=20&offset="
-    )
+        f"/root_comment?order_by=score&limit=20&offset=",
+        0,
+    ))
 
-    while next_url:
-        data = await _fetch_comment_page(page, next_url)
-
-        if not data.get("data"):
-            break
+    try:
+        while next_task is not None:
+            data = await next_task
+            next_task = None
 
-        for comment in data["data"]:
-            root = {
-                "author": _get_comment_author(comment),
-                "content": comment.get("content", ""),
-                "created_time": comment.get("created_time", 0),
-                "like_count": comment.get("like_count", 0),
-                "child_comments": [],
-            }
+            if not data.get("data"):
+                break
 
-            # 获取子评论（同样使用游标分页）
-            child_count = comment.get("child_comment_count", 0)
-            if child_count > 0:
-                comment_id = comment.get("id", "")
-                child_next_url = (
-                    f"https://www.zhihu.com/api/v4/comment_v5/comment/{comment_id}"
-                    f"/child_comment?order_by=ts&limit=20&offset="
+            # 游标拿到后立刻在后台预取下一页根评论，与本页子评论的获取重叠进行
+            paging = data.get("paging", {})
+            if not paging.get("is_end", True) and paging.get("next"):
+                next_task = asyncio.create_task(fetch_root_page(paging["next"], 0.5))
+
+            page_comments = data["data"]
+            roots = [
+                {
+                    "author": _user_name(comment.get("author")),
+                    "content": comment.get("content", ""),
+                    "created_time": comment.get("created_time", 0),
+                    "like_count": comment.get("like_count", 0),
+                    "child_comments": [],
+                }
+                for comment in page_comments
+            ]
+
+            # 有子评论的根评论，稍后并发获取其子评论
+            pending = [
+                (root, comment.get("id", ""))
+                for root, comment in zip(roots, page_comments)
+                if comment.get("child_comment_count", 0) > 0
+            ]
+
+            if pending:
+                results = await asyncio.gather(
+                    *(_fetch_child_comments(client, cid, sem, cache) for _, cid in pending)
                 )
-                while child_next_url:
-                    child_data = await _fetch_comment_page(page, child_next_url)
-
-                    if not child_data.get("data"):
-                        break
-
-                    for child in child_data["data"]:
-                        reply_to_author = child.get("reply_to_author")
-                        reply_to_name = ""
-                        if isinstance(reply_to_author, dict):
-                            reply_to_name = reply_to_author.get("name", "")
-                            if not reply_to_name:
-                                member = reply_to_author.get("member")
-                                if isinstance(member, dict):
-                                    reply_to_name = member.get("name", "")
-
-                        root["child_comments"].append({
-                            "author": _get_comment_author(child),
-                            "content": child.get("content", ""),
-                            "created_time": child.get("created_time", 0),
-                            "like_count": child.get("like_count", 0),
-                            "reply_to": reply_to_name,
-                        })
-
-                    child_paging = child_data.get("paging", {})
-                    if child_paging.get("is_end", True):
-                        break
-                    child_next_url = child_paging.get("next", "")
-                    await asyncio.sleep(0.3)
-
-            all_comments.append(root)
-
-        paging = data.get("paging", {})
-        if paging.get("is_end", True):
-            break
-        next_url = paging.get("next", "")
-        await asyncio.sleep(0.5)
+                for (root, _), children in zip(pending, results):
+                    root["child_comments"] = children
+
+            all_comments.extend(roots)
+    finally:
+        # 出错退出时取消尚未完成的预取
+        if next_task is not None:
+            next_task.cancel()
 
     total = len(all_comments)
     child_total = sum(len(c["child_comments"]) for c in all_comments)
@@ -767,7 +1092,10 @@ def format_comments_markdown(comments: list[dict]) -> str:
     if not comments:
         return ""
 
-    lines = ["\n\n---\n", "## 评论区\n"]
+    # 直接写入 StringIO，每条评论/子评论只写一次，省去大量小字符串的列表与最后的 join
+    buf = io.StringIO()
+    w = buf.write
+    w("\n\n---\n\n## 评论区\n")
 
     for i, comment in enumerate(comments, 1):
         ts = comment.get("created_time", 0)
@@ -776,8 +1104,7 @@ def format_comments_markdown(comments: list[dict]) -> str:
         likes = comment.get("like_count", 0)
         content = comment.get("content", "")
 
-        lines.append(f"### {i}楼 · {author} · {time_str} · 👍 {likes}\n")
-        lines.append(f"{content}\n")
+        w(f"\n### {i}楼 · {author} · {time_str} · 👍 {likes}\n\n{content}\n")
 
         # 子评论
         for child in comment.get("child_comments", []):
@@ -789,52 +1116,109 @@ def format_comments_markdown(comments: list[dict]) -> str:
             reply_to = child.get("reply_to", "")
 
             reply_prefix = f"回复 {reply_to} " if reply_to else ""
-            lines.append(f"> **{child_author}** {reply_prefix}· {child_time} · 👍 {child_likes}  ")
-            lines.append(f"> {child_content}")
-            lines.append(">")
+            w(f"\n> **{child_author}** {reply_prefix}· {child_time} · 👍 {child_likes}  \n"
+              f"> {child_content}\n>")
 
-        lines.append("")
+        w("\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
+
+
+# ── 文件写入 ─────────────────────────────────────────────────
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """一次写入 data 到临时文件再替换为 path，读者只会看到完整的旧文件或新文件。"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 
 # ── 图片下载 ─────────────────────────────────────────────────
 
-async def download_images(img_urls: list[str], dest: Path) -> dict[str, str]:
-    """下载图片到本地，返回 URL → 本地路径 的映射。"""
-    dest.mkdir(parents=True, exist_ok=True)
-    url_to_local: dict[str, str] = {}
+def _link_or_copy(src: Path, dst: Path) -> bool:
+    """
+    把已下载的图片 src 放到 dst：优先硬链接（不占额外空间），
+    跨文件系统等不支持时退回复制。src 已不存在（如被用户删除）时返回 False。
+    """
+    try:
+        os.link(src, dst)
+        return True
+    except FileExistsError:
+        return True
+    except OSError:
+        pass
+    tmp = dst.with_name(dst.name + ".tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+        return True
+    except OSError:
+        return False
 
-    limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
-    async with httpx.AsyncClient(
-        headers=IMG_HEADERS,
-        timeout=30.0,
-        follow_redirects=True,
-        limits=limits,
-    ) as client:
-        for img_url in img_urls:
-            try:
-                if img_url.startswith("//"):
-                    img_url = "https:" + img_url
 
-                if "data:image" in img_url or "equation" in img_url:
-                    continue
+async def download_images(
+    img_urls: list[str], dest: Path, client: httpx.AsyncClient | None = None,
+    image_cache: dict[str, Path] | None = None,
+) -> dict[str, str]:
+    """
+    下载图片到本地，返回 URL → 本地路径 的映射。
 
-                resp = await client.get(img_url)
-                resp.raise_for_status()
+    同一篇内容中的图片并发下载（同时在途的请求数不超过 IMG_CONCURRENCY），
+    重复出现的图片 URL 只下载一次，本地已存在的图片不会重复下载；
+    image_cache 中记录过的图片（同一次爬取里其他内容已下载的，如头像、常见表情图）
+    直接硬链接 / 复制过来。
 
-                ext = Path(urlparse(img_url).path).suffix or ".jpg"
-                if len(ext) > 5:
-                    ext = ".jpg"
+    Args:
+        img_urls: 图片 URL 列表
+        dest: 图片保存目录
+        client: 共享的 HTTP 客户端（可选，不传则临时创建）
+        image_cache: 本次爬取已下载图片的 URL → 本地文件映射（可选，会就地更新）
+    """
+    dest.mkdir(parents=True, exist_ok=True)
 
-                fname = hashlib.md5(img_url.encode()).hexdigest()[:12] + ext
-                fpath = dest / fname
-                fpath.write_bytes(resp.content)
-                url_to_local[img_url] = f"images/{fname}"
-            except Exception:
-                pass
+    urls = []
+    for img_url in img_urls:
+        if img_url.startswith("//"):
+            img_url = "https:" + img_url
+        if "data:image" in img_url or "equation" in img_url:
+            continue
+        urls.append(img_url)
+    # 去重并保持原有顺序
+    urls = list(dict.fromkeys(urls))
+
+    sem = asyncio.Semaphore(IMG_CONCURRENCY)
+    downloaded = {} if image_cache is None else image_cache
+
+    async def fetch_one(img_url: str) -> tuple[str, str | None]:
+        # 本地文件名只取决于 URL，先算出来：已下载过的图片直接复用，不再请求
+        ext = Path(urlparse(img_url).path).suffix or ".jpg"
+        if len(ext) > 5:
+            ext = ".jpg"
+        fname = hashlib.md5(img_url.encode()).hexdigest()[:12] + ext
+        fpath = dest / fname
+        if fpath.exists():
+            downloaded.setdefault(img_url, fpath)
+            return img_url, f"images/{fname}"
+
+        prev = downloaded.get(img_url)
+        if prev is not None and await asyncio.to_thread(_link_or_copy, prev, fpath):
+            return img_url, f"images/{fname}"
+
+        try:
+            async with sem:
+                resp = await client.get(img_url)
+            resp.raise_for_status()
+            # 原子写入：中断时不会留下半张图片（已存在的文件会被直接复用，不再重新下载）
+            await asyncio.to_thread(_write_atomic, fpath, resp.content)
+            downloaded[img_url] = fpath
+            return img_url, f"images/{fname}"
+        except Exception:
+            return img_url, None
+
+    async with _http_client_scope(client) as client:
+        results = await asyncio.gather(*(fetch_one(u) for u in urls))
 
-    return url_to_local
+    return {img_url: local for img_url, local in results if local}
 
 
 # ── 保存单篇内容为 Markdown ──────────────────────────────────
@@ -842,6 +1226,8 @@ async def download_images(img_urls: list[str], dest: Path) -> dict[str, str]:
 async def save_content_as_markdown(
     info: dict, output_dir: Path, download_img: bool = True,
     comments: list[dict] | None = None,
+    http_client: httpx.AsyncClient | None = None,
+    image_cache: dict[str, Path] | None = None,
 ) -> Path:
     """
     将提取到的内容保存为 Markdown 文件。
@@ -856,10 +1242,14 @@ async def save_content_as_markdown(
         output_dir: 输出根目录
         download_img: 是否下载图片到本地
         comments: 评论列表（可选，传入则追加评论区）
+        http_client: 共享的 HTTP 客户端（可选，用于下载图片）
+        image_cache: 本次爬取已下载图片的映射（可选，见 download_images）
 
     Returns:
         保存的文件路径
     """
+    from converter import ZhihuConverter
+
     title = info["title"]
     author = info["author"]
     date = info["date"]
@@ -867,9 +1257,8 @@ async def save_content_as_markdown(
     content_type = info["type"]
     url = info["url"]
 
-    type_labels = {"answer": "回答", "article": "文章", "pin": "想法"}
     type_dirs = {"answer": "answers", "article": "articles", "pin": "pins"}
-    type_label = type_labels.get(content_type, "内容")
+    type_label = _TYPE_LABELS.get(content_type, "内容")
 
     # 按类型分目录
     type_dir = output_dir / type_dirs.get(content_type, "other")
@@ -885,7 +1274,7 @@ async def save_content_as_markdown(
         if img_urls:
             print(f"   🖼️  发现 {len(img_urls)} 张图片，正在下载...")
             img_dir = folder / "images"
-            img_map = await download_images(img_urls, img_dir)
+            img_map = await download_images(img_urls, img_dir, http_client, image_cache)
             print(f"   ✅ 成功下载 {len(img_map)} 张图片")
             if img_dir.exists() and not any(img_dir.iterdir()):
                 img_dir.rmdir()
@@ -918,34 +1307,304 @@ async def save_content_as_markdown(
     if comments:
         comments_md = format_comments_markdown(comments)
 
-    md_path.write_text(header + md + comments_md, encoding="utf-8")
+    # 在线程中写盘，不阻塞同时进行的图片下载和页面加载
+    await asyncio.to_thread(_write_atomic, md_path, (header + md + comments_md).encode("utf-8"))
 
     return md_path
 
 
+def _iter_saved_md(type_dir: Path):
+    """
+    逐个产出类型目录中已保存的 Markdown 文件路径（字符串）。
+
+    只看 type_dir 的直接子项：子文件夹只检查其中的 index.md，
+    不进入 images/ 等目录（磁盘上的绝大多数文件都在那里）。
+    """
+    with os.scandir(type_dir) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                index_md = os.path.join(entry.path, "index.md")
+                if os.path.isfile(index_md):
+                    yield index_md
+            elif entry.name.endswith(".md"):
+                yield entry.path
+
+
+def _read_source_url(md_file: str) -> str | None:
+    """从 Markdown 文件头部的元信息中读取来源 URL，读不到时返回 None。"""
+    try:
+        # 来源 URL 在文件头部的元信息里，只读开头一小段字节，不读取整个文件
+        with open(md_file, "rb") as f:
+            head = f.read(_HEAD_BYTES)
+    except OSError:
+        return None
+    m = _URL_META_RE.search(head.decode("utf-8", errors="ignore"))
+    return m.group(1) if m else None
+
+
 def _scan_done_urls_from_disk(output_dir: Path) -> set[str]:
     """
     扫描输出目录中已存在的 Markdown 文件，从文件头部提取来源 URL。
     兼容两种结构：
       - 普通模式（有图片）：<type_dir>/<子文件夹>/index.md
       - --no-images 模式：<type_dir>/<日期_标题>.md（直接在类型目录中）
+
+    文件很多时耗时主要在逐个 open/read 的磁盘等待上，用线程池并发读取。
     """
-    done = set()
-    url_pattern = re.compile(r'>\s*\*\*来源\*\*:\s*\[([^\]]+)\]')
+    md_files = []
     for subdir in ("answers", "articles", "pins"):
         type_dir = output_dir / subdir
-        if not type_dir.exists():
-            continue
-        # 兼容两种结构：递归匹配所有 .md 文件
-        for md_file in type_dir.rglob("*.md"):
+        if type_dir.is_dir():
+            md_files.extend(_iter_saved_md(type_dir))
+    if not md_files:
+        return set()
+
+    with ThreadPoolExecutor(max_workers=min(DISK_SCAN_WORKERS, len(md_files))) as pool:
+        urls = pool.map(_read_source_url, md_files, chunksize=64)
+        return {url for url in urls if url}
+
+
+def _write_compact_json(path: Path, data) -> None:
+    """
+    以紧凑格式（无缩进、无多余空格）写出 JSON，链接很多时文件明显更小、写得更快。
+    先写临时文件再替换，中断时不会留下半个文件。
+    """
+    _write_atomic(
+        path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def _load_fresh_links(links_file: Path, key: str, **meta) -> list[str] | None:
+    """
+    读取 LINKS_MAX_AGE 内保存的链接列表 links_file[key]。
+
+    文件不存在、已过期、损坏，或记录的参数（meta，如 question_id / max_answers）
+    与本次不一致时返回 None，表示需要重新收集。
+    """
+    try:
+        data = json.loads(links_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or time.time() - data.get("collected_at", 0) > LINKS_MAX_AGE:
+        return None
+    if any(data.get(k) != v for k, v in meta.items()):
+        return None
+    urls = data.get(key)
+    return urls if isinstance(urls, list) and urls else None
+
+
+def _load_progress(progress_file: Path) -> set[str]:
+    """
+    读取进度日志（JSONL，每行一个已完成的 URL）。
+
+    日志不存在但有旧版 {"done": [...]} 格式的 .json 进度文件时，读取后迁移为日志。
+    最后一行若因中断只写了一半，直接忽略。
+    """
+    done: set[str] = set()
+    if progress_file.exists():
+        line = "\n"
+        with progress_file.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line))
+                except ValueError:
+                    pass
+        # 补上被截断的最后一行的换行符，避免下一条追加的记录与它粘在一起
+        if not line.endswith("\n"):
+            with progress_file.open("a", encoding="utf-8") as f:
+                f.write("\n")
+        return done
+
+    legacy_file = progress_file.with_suffix(".json")
+    if legacy_file.exists():
+        try:
+            done = set(json.loads(legacy_file.read_text(encoding="utf-8")).get("done", []))
+        except Exception:
+            pass
+        _append_progress(progress_file, done)
+    return done
+
+
+def _append_progress(progress_file: Path, urls) -> None:
+    """把新完成的 URL 追加到进度日志，不重写已有内容。"""
+    if not urls:
+        return
+    with progress_file.open("a", encoding="utf-8") as f:
+        f.writelines(json.dumps(url, ensure_ascii=False) + "\n" for url in urls)
+
+
+class _ProgressLog:
+    """
+    爬取过程中持续追加的进度日志：文件只打开一次，每条记录写入后立即 flush。
+
+    与 _append_progress 每次重新打开文件相比，省去了逐条 open/close 的开销；
+    flush 保证中断时已写入的记录不会丢在缓冲区里。
+    """
+
+    def __init__(self, progress_file: Path):
+        self._file = progress_file.open("a", encoding="utf-8")
+
+    def add(self, url: str) -> None:
+        self._file.write(json.dumps(url, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _BackgroundSaver:
+    """
+    在后台保存已提取的内容（HTML → Markdown、下载图片、记录进度），
+    与下一篇内容的限速等待和页面加载重叠进行。
+
+    同一时间最多只有一篇在保存：提交新内容前会先等上一篇保存完成。
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        download_img: bool,
+        http_client: httpx.AsyncClient,
+        progress: _ProgressLog,
+        done_urls: set[str],
+        image_cache: dict[str, Path],
+    ):
+        self.output_dir = output_dir
+        self.download_img = download_img
+        self.http_client = http_client
+        self.progress = progress
+        self.done_urls = done_urls
+        self.image_cache = image_cache
+        self.saved = 0
+        self.failed = 0
+        self._pending: tuple[str, asyncio.Task] | None = None
+
+    async def submit(self, info: dict) -> None:
+        """开始在后台保存 info（先等待上一篇保存完成）。"""
+        await self.flush()
+        task = asyncio.create_task(save_content_as_markdown(
+            info, self.output_dir, self.download_img,
+            http_client=self.http_client, image_cache=self.image_cache,
+        ))
+        self._pending = (info["url"], task)
+
+    async def flush(self) -> None:
+        """等待正在保存的内容完成，并记录结果。"""
+        if self._pending is None:
+            return
+        url, task = self._pending
+        self._pending = None
+        try:
+            md_path = await task
+        except Exception as e:
+            self.failed += 1
+            print(f"   ❌ 保存失败: {url}  ({e})")
+            return
+        print(f"   💾 已保存: {md_path}")
+        self.saved += 1
+        self.done_urls.add(url)
+        # 同步追加，中间没有 await，多个页面同时保存时也不会交错
+        self.progress.add(url)
+
+
+async def _crawl_with_pages(
+    context: BrowserContext,
+    page: Page,
+    queue: asyncio.Queue[tuple[int, str, str]],
+    total: int,
+    parallel_pages: int,
+    rate_limiter: TokenBucket,
+    saver_factory,
+) -> tuple[int, int]:
+    """
+    用 parallel_pages 个页面并发爬取 queue 中的 (序号, URL, 类型)，返回 (成功数, 失败数)。
+
+    所有页面共享同一个浏览器上下文和限速器：总体请求速率不变，只是页面加载的等待可以互相重叠。
+    触发反爬时由限速器统一退避，所有页面一起放慢或暂停。
+    每个页面各自用 saver_factory() 创建的 _BackgroundSaver 在后台保存上一篇。
+    某个页面爬取出错时关闭它并换上新页面，避免一个坏掉的页面拖累后续请求。
+    """
+    extractors = {"answer": extract_answer, "article": extract_article, "pin": extract_pin}
+    success_count = 0
+    fail_count = 0
+
+    async def crawl(slot: int, saver: _BackgroundSaver) -> None:
+        nonlocal fail_count
+        while True:
+            try:
+                idx, url, content_type = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            # 请求间限速（令牌桶：上一次请求本身的耗时也计入间隔）；
+            # 等待信息和要爬取的内容合并成一行，多个页面同时输出时不会对不上号
+            delay = rate_limiter.reserve()
+            label = _TYPE_LABELS[content_type]
+            if delay > 0:
+                print(f"[{idx}/{total}] ⏳ {delay:.1f} 秒后爬取{label}: {url}")
+                await asyncio.sleep(delay)
+            else:
+                print(f"[{idx}/{total}] 📥 正在爬取{label}: {url}")
+
             try:
-                text = md_file.read_text(encoding="utf-8")[:500]
-                m = url_pattern.search(text)
-                if m:
-                    done.add(m.group(1))
+                info = await extractors[content_type](pages[slot], url)
+                rate_limiter.report_success()
+                await saver.submit(info)
+
+            except Exception as e:
+                fail_count += 1
+                print(f"   ❌ 失败: {e}")
+
+                # 出错的页面可能停在异常状态（崩溃、卡在验证页等），换一个新页面继续
+                await _replace_page(slot)
+
+                # 如果触发反爬，放慢共享限速器（所有页面一起生效）
+                if "40362" in str(e) or "反爬" in str(e):
+                    pause = rate_limiter.report_blocked()
+                    if pause > 0:
+                        print(f"   ⚠️  连续触发反爬机制，所有页面暂停 {pause:.0f} 秒...")
+                    else:
+                        print(f"   ⚠️  触发反爬机制，请求间隔放慢到 {rate_limiter.backoff:.1f} 倍")
+
+    async def _replace_page(slot: int) -> None:
+        old = pages[slot]
+        try:
+            pages[slot] = await context.new_page()
+        except Exception:
+            # 新页面都开不出来时继续用旧页面，交给后续请求自行报错
+            return
+        try:
+            await old.close()
+        except Exception:
+            pass
+
+    async def worker(slot: int) -> None:
+        nonlocal success_count, fail_count
+        saver = saver_factory()
+        try:
+            await crawl(slot, saver)
+        finally:
+            await saver.flush()
+            success_count += saver.saved
+            fail_count += saver.failed
+
+    # 第一个 worker 复用收集链接时的页面，其余各自新开一个页面；
+    # 每个 worker 固定使用 pages 中自己的槽位，页面出错时原地替换
+    n_workers = max(1, min(parallel_pages, queue.qsize()))
+    pages = [page] + [await context.new_page() for _ in range(n_workers - 1)]
+    try:
+        await asyncio.gather(*(worker(slot) for slot in range(n_workers)))
+    finally:
+        # 槽位 0 若未被替换仍是调用方的页面，交给调用方随上下文一起关闭
+        for p in pages:
+            if p is page:
+                continue
+            try:
+                await p.close()
             except Exception:
                 pass
-    return done
+
+    return success_count, fail_count
 
 
 # ── 主爬取流程 ────────────────────────────────────────────────
@@ -959,6 +1618,10 @@ async def scrape_user(
     delay_min: float = 5.0,
     delay_max: float = 10.0,
     headless: bool = False,
+    http_client: httpx.AsyncClient | None = None,
+    playwright: Playwright | None = None,
+    rate_limiter: TokenBucket | None = None,
+    parallel_pages: int = MAX_PARALLEL_PAGES,
 ):
     """
     爬取指定知乎用户的所有回答和/或文章。
@@ -973,10 +1636,13 @@ async def scrape_user(
         delay_min: 请求间最小延迟（秒）
         delay_max: 请求间最大延迟（秒）
         headless: 是否使用无头模式
+        http_client: 共享的 HTTP 客户端（可选，不传则本次爬取内部创建一个）
+        playwright: 共享的 Playwright 实例（可选，不传则本次爬取内部启动一个）
+        rate_limiter: 请求限速器（可选，不传则按 delay_min/delay_max 构造）
+        parallel_pages: 同时打开的内容页面数（共享同一个限速器）
     """
-    global MIN_DELAY, MAX_DELAY
-    MIN_DELAY = delay_min
-    MAX_DELAY = delay_max
+    if rate_limiter is None:
+        rate_limiter = TokenBucket.from_delay(delay_min, delay_max)
 
     if output_dir is None:
         output_dir = DEFAULT_OUTPUT_DIR / sanitize_filename(user_url_token)
@@ -990,121 +1656,94 @@ async def scrape_user(
     print(f"   爬取文章: {'是' if scrape_articles else '否'}")
     print(f"   下载图片: {'是' if download_img else '否'}")
     print(f"   请求延迟: {delay_min}-{delay_max} 秒")
+    print(f"   并发页面: {parallel_pages}")
     print("=" * 60)
 
-    async with async_playwright() as pw:
+    async with _playwright_scope(playwright) as pw, _http_client_scope(http_client) as http_client:
         context = await create_browser_context(pw, headless=headless)
 
         try:
             page = context.pages[0] if context.pages else await context.new_page()
 
             # ── 收集链接 ──
-            all_urls = []
+            # 回答与文章分别存放在两个列表中，不再为每条链接构造 (url, type) 元组
+            answer_urls: list[str] = []
+            article_urls: list[str] = []
 
             if scrape_answers:
                 print("\n📝 正在收集回答列表...")
                 answer_urls = await collect_user_answers(page, user_url_token)
                 print(f"   共发现 {len(answer_urls)} 个回答")
-                all_urls.extend([(url, "answer") for url in answer_urls])
 
             if scrape_articles:
                 print("\n📝 正在收集文章列表...")
                 # 在收集文章之前添加延迟
                 if scrape_answers:
-                    delay = random_delay()
-                    print(f"   ⏳ 等待 {delay:.1f} 秒...")
-                    await asyncio.sleep(delay)
+                    delay = rate_limiter.reserve()
+                    if delay > 0:
+                        print(f"   ⏳ 等待 {delay:.1f} 秒...")
+                        await asyncio.sleep(delay)
                 article_urls = await collect_user_articles(page, user_url_token)
                 print(f"   共发现 {len(article_urls)} 篇文章")
-                all_urls.extend([(url, "article") for url in article_urls])
 
-            if not all_urls:
+            total = len(answer_urls) + len(article_urls)
+            if not total:
                 print("\n⚠️  未发现任何内容，请检查用户 URL token 是否正确。")
                 return
 
-            total = len(all_urls)
             print(f"\n🚀 共计 {total} 项内容待爬取\n")
 
             # ── 保存链接列表（用于断点续传） ──
             links_file = output_dir / "links.json"
-            links_data = [{"url": url, "type": t} for url, t in all_urls]
-            links_file.write_text(
-                json.dumps(links_data, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            links_data = {"answers": answer_urls, "articles": article_urls}
+            _write_compact_json(links_file, links_data)
             print(f"📋 链接列表已保存到: {links_file}\n")
 
             # ── 检查已爬取的内容（断点续传） ──
-            progress_file = output_dir / "progress.json"
-            done_urls = set()
-            if progress_file.exists():
-                try:
-                    done_data = json.loads(progress_file.read_text(encoding="utf-8"))
-                    done_urls = set(done_data.get("done", []))
-                except Exception:
-                    pass
+            progress_file = output_dir / "progress.jsonl"
+            done_urls = _load_progress(progress_file)
 
-            # 扫描磁盘上已存在的文件，补充 progress.json 可能遗漏的记录
+            # 扫描磁盘上已存在的文件，补充进度日志可能遗漏的记录
             disk_urls = _scan_done_urls_from_disk(output_dir)
-            if disk_urls - done_urls:
-                print(f"📂 从磁盘扫描发现 {len(disk_urls - done_urls)} 个已下载但未记录的内容")
-                done_urls |= disk_urls
+            new_on_disk = disk_urls - done_urls
+            if new_on_disk:
+                print(f"📂 从磁盘扫描发现 {len(new_on_disk)} 个已下载但未记录的内容")
+                done_urls |= new_on_disk
+                _append_progress(progress_file, new_on_disk)
 
             if done_urls:
                 # 只统计与当前链接列表匹配的数量
-                matched = sum(1 for url, _ in all_urls if url in done_urls)
+                matched = sum(1 for url in chain(answer_urls, article_urls) if url in done_urls)
                 print(f"📌 检测到之前的进度，已完成 {matched}/{total} 项，将跳过。\n")
 
-                # 同步更新 progress.json
-                progress_file.write_text(
-                    json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                    encoding="utf-8",
-                )
-
-            # ── 逐个爬取 ──
+            # ── 并发爬取 ──
             success_count = 0
-            fail_count = 0
 
+            queue: asyncio.Queue[tuple[int, str, str]] = asyncio.Queue()
+            all_urls = chain(
+                ((url, "answer") for url in answer_urls),
+                ((url, "article") for url in article_urls),
+            )
             for idx, (url, content_type) in enumerate(all_urls, 1):
+                # 已完成的内容只计数，不逐条输出（前面已打印过跳过的总数）
                 if url in done_urls:
-                    print(f"[{idx}/{total}] ⏭️  跳过（已完成）: {url}")
                     success_count += 1
                     continue
+                queue.put_nowait((idx, url, content_type))
 
-                print(f"[{idx}/{total}] 📥 正在爬取{' 回答' if content_type == 'answer' else '文章'}: {url}")
-
-                try:
-                    if content_type == "answer":
-                        info = await extract_answer(page, url)
-                    else:
-                        info = await extract_article(page, url)
-
-                    md_path = await save_content_as_markdown(info, output_dir, download_img)
-                    print(f"   💾 已保存: {md_path}")
-
-                    success_count += 1
-                    done_urls.add(url)
-
-                    # 更新进度
-                    progress_file.write_text(
-                        json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
-
-                except Exception as e:
-                    fail_count += 1
-                    print(f"   ❌ 失败: {e}")
-
-                    # 如果触发反爬，加大延迟
-                    if "40362" in str(e) or "反爬" in str(e):
-                        extra_wait = 30 + random.random() * 30
-                        print(f"   ⚠️  触发反爬机制，额外等待 {extra_wait:.0f} 秒...")
-                        await asyncio.sleep(extra_wait)
-
-                # 请求间延迟
-                if idx < total:
-                    delay = random_delay()
-                    print(f"   ⏳ 等待 {delay:.1f} 秒...\n")
-                    await asyncio.sleep(delay)
+            progress = _ProgressLog(progress_file)
+            # 本次爬取中已下载过的图片，各页面共用，只在本次调用内有效
+            image_cache: dict[str, Path] = {}
+            try:
+                saved, fail_count = await _crawl_with_pages(
+                    context, page, queue, total, parallel_pages, rate_limiter,
+                    lambda: _BackgroundSaver(
+                        output_dir, download_img, http_client, progress, done_urls, image_cache
+                    ),
+                )
+            finally:
+                progress.close()
+            success_count += saved
 
             # ── 汇总 ──
             print("\n" + "=" * 60)
@@ -1126,6 +1765,11 @@ async def scrape_question(
     delay_min: float = 10.0,
     delay_max: float = 20.0,
     headless: bool = False,
+    http_client: httpx.AsyncClient | None = None,
+    playwright: Playwright | None = None,
+    rate_limiter: TokenBucket | None = None,
+    parallel_pages: int = MAX_PARALLEL_PAGES,
+    reuse_links: bool = True,
 ):
     """
     爬取指定知乎问题下的回答。
@@ -1138,10 +1782,14 @@ async def scrape_question(
         delay_min: 请求间最小延迟（秒）
         delay_max: 请求间最大延迟（秒）
         headless: 是否使用无头模式
+        http_client: 共享的 HTTP 客户端（可选，不传则本次爬取内部创建一个）
+        playwright: 共享的 Playwright 实例（可选，不传则本次爬取内部启动一个）
+        rate_limiter: 请求限速器（可选，不传则按 delay_min/delay_max 构造）
+        parallel_pages: 同时打开的回答页面数（共享同一个限速器）
+        reuse_links: 是否复用 LINKS_MAX_AGE 内收集的回答列表（links.json），跳过重新滚动收集
     """
-    global MIN_DELAY, MAX_DELAY
-    MIN_DELAY = delay_min
-    MAX_DELAY = delay_max
+    if rate_limiter is None:
+        rate_limiter = TokenBucket.from_delay(delay_min, delay_max)
 
     question_id = parse_question_id(question_input)
 
@@ -1158,97 +1806,88 @@ async def scrape_question(
     print(f"   输出目录: {output_dir.resolve()}")
     print(f"   下载图片: {'是' if download_img else '否'}")
     print(f"   请求延迟: {delay_min}-{delay_max} 秒")
+    print(f"   并发页面: {parallel_pages}")
     print("=" * 60)
 
-    async with async_playwright() as pw:
+    async with _playwright_scope(playwright) as pw, _http_client_scope(http_client) as http_client:
         context = await create_browser_context(pw, headless=headless)
 
         try:
             page = context.pages[0] if context.pages else await context.new_page()
 
-            # ── 收集回答链接 ──
-            print("\n📝 正在收集回答列表...")
-            answer_urls = await collect_question_answer_links(page, question_id, max_answers)
-            print(f"   共发现 {len(answer_urls)} 个回答")
+            # ── 收集回答链接（上次运行的列表仍然新鲜时直接复用） ──
+            links_file = output_dir / "links.json"
+            answer_urls = None
+            if reuse_links:
+                answer_urls = _load_fresh_links(
+                    links_file, "answers", question_id=question_id, max_answers=max_answers
+                )
+
+            if answer_urls is not None:
+                print(f"\n📋 复用 {LINKS_MAX_AGE // 3600} 小时内收集的回答列表: {links_file}")
+                print(f"   共 {len(answer_urls)} 个回答")
+            else:
+                print("\n📝 正在收集回答列表...")
+                answer_urls = await collect_question_answer_links(page, question_id, max_answers)
+                print(f"   共发现 {len(answer_urls)} 个回答")
 
-            if not answer_urls:
-                print("\n⚠️  未发现任何回答，请检查问题 ID 是否正确。")
-                return
+                if not answer_urls:
+                    print("\n⚠️  未发现任何回答，请检查问题 ID 是否正确。")
+                    return
+
+                # ── 保存链接列表（附带收集参数和时间，供下次运行判断能否复用） ──
+                links_data = {
+                    "question_id": question_id,
+                    "max_answers": max_answers,
+                    "collected_at": time.time(),
+                    "answers": answer_urls,
+                }
+                _write_compact_json(links_file, links_data)
+                print(f"📋 链接列表已保存到: {links_file}")
 
             total = len(answer_urls)
             print(f"\n🚀 共计 {total} 个回答待爬取\n")
 
-            # ── 保存链接列表 ──
-            links_file = output_dir / "links.json"
-            links_data = [{"url": url, "type": "answer"} for url in answer_urls]
-            links_file.write_text(
-                json.dumps(links_data, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
-            print(f"📋 链接列表已保存到: {links_file}\n")
-
             # ── 断点续传 ──
-            progress_file = output_dir / "progress.json"
-            done_urls = set()
-            if progress_file.exists():
-                try:
-                    done_data = json.loads(progress_file.read_text(encoding="utf-8"))
-                    done_urls = set(done_data.get("done", []))
-                except Exception:
-                    pass
+            progress_file = output_dir / "progress.jsonl"
+            done_urls = _load_progress(progress_file)
 
-            # 扫描磁盘上已存在的文件，补充 progress.json 可能遗漏的记录
+            # 扫描磁盘上已存在的文件，补充进度日志可能遗漏的记录
             disk_urls = _scan_done_urls_from_disk(output_dir)
-            if disk_urls - done_urls:
-                print(f"📂 从磁盘扫描发现 {len(disk_urls - done_urls)} 个已下载但未记录的内容")
-                done_urls |= disk_urls
+            new_on_disk = disk_urls - done_urls
+            if new_on_disk:
+                print(f"📂 从磁盘扫描发现 {len(new_on_disk)} 个已下载但未记录的内容")
+                done_urls |= new_on_disk
+                _append_progress(progress_file, new_on_disk)
 
             if done_urls:
                 matched = sum(1 for u in answer_urls if u in done_urls)
                 print(f"📌 检测到之前的进度，已完成 {matched}/{total} 项，将跳过。\n")
 
-                progress_file.write_text(
-                    json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                    encoding="utf-8",
-                )
-
-            # ── 逐个爬取 ──
+            # ── 并发爬取 ──
             success_count = 0
-            fail_count = 0
 
+            queue: asyncio.Queue[tuple[int, str, str]] = asyncio.Queue()
             for idx, url in enumerate(answer_urls, 1):
+                # 已完成的内容只计数，不逐条输出（前面已打印过跳过的总数）
                 if url in done_urls:
-                    print(f"[{idx}/{total}] ⏭️  跳过（已完成）: {url}")
                     success_count += 1
                     continue
+                queue.put_nowait((idx, url, "answer"))
 
-                print(f"[{idx}/{total}] 📥 正在爬取回答: {url}")
-
-                try:
-                    info = await extract_answer(page, url)
-                    md_path = await save_content_as_markdown(info, output_dir, download_img)
-                    print(f"   💾 已保存: {md_path}")
-
-                    success_count += 1
-                    done_urls.add(url)
-
-                    progress_file.write_text(
-                        json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
-
-                except Exception as e:
-                    fail_count += 1
-                    print(f"   ❌ 失败: {e}")
-
-                    if "40362" in str(e) or "反爬" in str(e):
-                        extra_wait = 30 + random.random() * 30
-                        print(f"   ⚠️  触发反爬机制，额外等待 {extra_wait:.0f} 秒...")
-                        await asyncio.sleep(extra_wait)
-
-                if idx < total:
-                    delay = random_delay()
-                    print(f"   ⏳ 等待 {delay:.1f} 秒...\n")
-                    await asyncio.sleep(delay)
+            progress = _ProgressLog(progress_file)
+            # 本次爬取中已下载过的图片，各页面共用，只在本次调用内有效
+            image_cache: dict[str, Path] = {}
+            try:
+                saved, fail_count = await _crawl_with_pages(
+                    context, page, queue, total, parallel_pages, rate_limiter,
+                    lambda: _BackgroundSaver(
+                        output_dir, download_img, http_client, progress, done_urls, image_cache
+                    ),
+                )
+            finally:
+                progress.close()
+            success_count += saved
 
             # ── 问题爬取汇总 ──
             print("\n" + "=" * 60)
@@ -1267,26 +1906,27 @@ async def scrape_single_answer(
     output_dir: Path | None = None,
     download_img: bool = True,
     with_comments: bool = False,
-    delay_min: float = 10.0,
-    delay_max: float = 20.0,
+    comment_concurrency: int = 4,
+    use_cache: bool = False,
     headless: bool = False,
+    http_client: httpx.AsyncClient | None = None,
+    playwright: Playwright | None = None,
 ):
     """
     爬取单个知乎回答（可选附带评论区）。
+    只加载一个页面，因此没有请求间延迟 / 限速参数。
 
     Args:
         answer_input: 回答 URL（包含 /question/xxx/answer/xxx）
         output_dir: 输出目录
         download_img: 是否下载图片
         with_comments: 是否同时爬取评论区
-        delay_min: 请求间最小延迟（秒）
-        delay_max: 请求间最大延迟（秒）
+        comment_concurrency: 并发获取子评论时的最大在途请求数
+        use_cache: 是否使用本地响应缓存获取评论（重复运行时跳过网络请求）
         headless: 是否使用无头模式
+        http_client: 共享的 HTTP 客户端（可选，不传则本次爬取内部创建一个）
+        playwright: 共享的 Playwright 实例（可选，不传则本次爬取内部启动一个）
     """
-    global MIN_DELAY, MAX_DELAY
-    MIN_DELAY = delay_min
-    MAX_DELAY = delay_max
-
     answer_url, question_id, answer_id = parse_answer_url(answer_input)
 
     if output_dir is None:
@@ -1301,7 +1941,7 @@ async def scrape_single_answer(
     print(f"   下载图片: {'是' if download_img else '否'}")
     print("=" * 60)
 
-    async with async_playwright() as pw:
+    async with _playwright_scope(playwright) as pw, _http_client_scope(http_client) as http_client:
         context = await create_browser_context(pw, headless=headless)
 
         try:
@@ -1313,10 +1953,22 @@ async def scrape_single_answer(
             # 获取评论
             comments = None
             if with_comments:
-                comments = await extract_comments(page, answer_id)
+                # 导出浏览器的知乎 Cookie，评论 API 直接用 HTTP 请求，不再经过浏览器 fetch
+                cookies = {
+                    c["name"]: c["value"]
+                    for c in await context.cookies("https://www.zhihu.com/")
+                }
+                cache = None
+                if use_cache:
+                    # 缓存按登录身份（z_c0 Cookie）区分，避免不同账号的数据互相串用
+                    cache = ResponseCache(identity=cookies.get("z_c0", ""))
+                async with create_api_client(cookies, answer_url) as api_client:
+                    comments = await extract_comments(
+                        api_client, answer_id, comment_concurrency, cache
+                    )
 
             md_path = await save_content_as_markdown(
-                info, output_dir, download_img, comments=comments
+                info, output_dir, download_img, comments=comments, http_client=http_client
             )
             print(f"   💾 已保存: {md_path}")
 
@@ -1336,6 +1988,10 @@ async def scrape_user_pins(
     delay_min: float = 5.0,
     delay_max: float = 10.0,
     headless: bool = False,
+    http_client: httpx.AsyncClient | None = None,
+    playwright: Playwright | None = None,
+    rate_limiter: TokenBucket | None = None,
+    parallel_pages: int = MAX_PARALLEL_PAGES,
 ):
     """
     爬取指定知乎用户的所有想法。
@@ -1347,10 +2003,13 @@ async def scrape_user_pins(
         delay_min: 请求间最小延迟（秒）
         delay_max: 请求间最大延迟（秒）
         headless: 是否使用无头模式
+        http_client: 共享的 HTTP 客户端（可选，不传则本次爬取内部创建一个）
+        playwright: 共享的 Playwright 实例（可选，不传则本次爬取内部启动一个）
+        rate_limiter: 请求限速器（可选，不传则按 delay_min/delay_max 构造）
+        parallel_pages: 同时打开的想法页面数（共享同一个限速器）
     """
-    global MIN_DELAY, MAX_DELAY
-    MIN_DELAY = delay_min
-    MAX_DELAY = delay_max
+    if rate_limiter is None:
+        rate_limiter = TokenBucket.from_delay(delay_min, delay_max)
 
     if output_dir is None:
         output_dir = DEFAULT_OUTPUT_DIR / sanitize_filename(user_url_token)
@@ -1362,9 +2021,10 @@ async def scrape_user_pins(
     print(f"   输出目录: {output_dir.resolve()}")
     print(f"   下载图片: {'是' if download_img else '否'}")
     print(f"   请求延迟: {delay_min}-{delay_max} 秒")
+    print(f"   并发页面: {parallel_pages}")
     print("=" * 60)
 
-    async with async_playwright() as pw:
+    async with _playwright_scope(playwright) as pw, _http_client_scope(http_client) as http_client:
         context = await create_browser_context(pw, headless=headless)
 
         try:
@@ -1379,84 +2039,56 @@ async def scrape_user_pins(
                 print("\n⚠️  未发现任何想法，请检查用户 URL token 是否正确。")
                 return
 
-            all_urls = [(url, "pin") for url in pin_urls]
-            total = len(all_urls)
+            total = len(pin_urls)
             print(f"\n🚀 共计 {total} 条想法待爬取\n")
 
             # ── 保存链接列表 ──
             links_file = output_dir / "pin_links.json"
-            links_data = [{"url": url, "type": "pin"} for url in pin_urls]
-            links_file.write_text(
-                json.dumps(links_data, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            links_data = {"pins": pin_urls}
+            _write_compact_json(links_file, links_data)
             print(f"📋 链接列表已保存到: {links_file}\n")
 
             # ── 断点续传 ──
-            progress_file = output_dir / "pin_progress.json"
-            done_urls = set()
-            if progress_file.exists():
-                try:
-                    done_data = json.loads(progress_file.read_text(encoding="utf-8"))
-                    done_urls = set(done_data.get("done", []))
-                except Exception:
-                    pass
+            progress_file = output_dir / "pin_progress.jsonl"
+            done_urls = _load_progress(progress_file)
 
             # 扫描磁盘上已存在的文件
             disk_urls = _scan_done_urls_from_disk(output_dir)
-            if disk_urls - done_urls:
-                print(f"📂 从磁盘扫描发现 {len(disk_urls - done_urls)} 个已下载但未记录的内容")
-                done_urls |= disk_urls
+            new_on_disk = disk_urls - done_urls
+            if new_on_disk:
+                print(f"📂 从磁盘扫描发现 {len(new_on_disk)} 个已下载但未记录的内容")
+                done_urls |= new_on_disk
+                _append_progress(progress_file, new_on_disk)
 
             if done_urls:
-                matched = sum(1 for url, _ in all_urls if url in done_urls)
+                matched = sum(1 for url in pin_urls if url in done_urls)
                 if matched > 0:
                     print(f"📌 检测到之前的进度，已完成 {matched}/{total} 项，将跳过。\n")
 
-                    progress_file.write_text(
-                        json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
-
-            # ── 逐个爬取 ──
+            # ── 并发爬取 ──
             success_count = 0
-            fail_count = 0
 
-            for idx, (url, content_type) in enumerate(all_urls, 1):
+            queue: asyncio.Queue[tuple[int, str, str]] = asyncio.Queue()
+            for idx, url in enumerate(pin_urls, 1):
+                # 已完成的内容只计数，不逐条输出（前面已打印过跳过的总数）
                 if url in done_urls:
-                    print(f"[{idx}/{total}] ⏭️  跳过（已完成）: {url}")
                     success_count += 1
                     continue
+                queue.put_nowait((idx, url, "pin"))
 
-                print(f"[{idx}/{total}] 📥 正在爬取想法: {url}")
-
-                try:
-                    info = await extract_pin(page, url)
-
-                    md_path = await save_content_as_markdown(info, output_dir, download_img)
-                    print(f"   💾 已保存: {md_path}")
-
-                    success_count += 1
-                    done_urls.add(url)
-
-                    progress_file.write_text(
-                        json.dumps({"done": list(done_urls)}, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
-
-                except Exception as e:
-                    fail_count += 1
-                    print(f"   ❌ 失败: {e}")
-
-                    if "40362" in str(e) or "反爬" in str(e):
-                        extra_wait = 30 + random.random() * 30
-                        print(f"   ⚠️  触发反爬机制，额外等待 {extra_wait:.0f} 秒...")
-                        await asyncio.sleep(extra_wait)
-
-                # 请求间延迟
-                if idx < total:
-                    delay = random_delay()
-                    print(f"   ⏳ 等待 {delay:.1f} 秒...\n")
-                    await asyncio.sleep(delay)
+            progress = _ProgressLog(progress_file)
+            # 本次爬取中已下载过的图片，各页面共用，只在本次调用内有效
+            image_cache: dict[str, Path] = {}
+            try:
+                saved, fail_count = await _crawl_with_pages(
+                    context, page, queue, total, parallel_pages, rate_limiter,
+                    lambda: _BackgroundSaver(
+                        output_dir, download_img, http_client, progress, done_urls, image_cache
+                    ),
+                )
+            finally:
+                progress.close()
+            success_count += saved
 
             # ── 汇总 ──
             print("\n" + "=" * 60)
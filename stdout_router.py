@@ -0,0 +1,60 @@
+"""
+stdout_router.py — 按执行上下文转发 print() 输出
+
+TUI / WebUI 在工作线程中运行爬虫，需要把 scraper 的 print() 输出显示到界面上。
+直接替换 sys.stdout 是进程全局的：同时运行的多个任务（例如 WebUI 的多个会话）
+会互相覆盖、串到别人的日志里，任务结束时还可能把 sys.stdout 恢复成别人的 writer。
+
+这里只在第一次使用时把 sys.stdout 换成一个路由对象，之后每次 write() 按当前
+contextvars 上下文选择目标：
+
+    with redirect_stdout(writer):
+        ...  # 本线程及其中创建的 asyncio 任务 / asyncio.to_thread 的 print() 都写入 writer
+
+未处于 redirect_stdout() 中的代码照常输出到原来的 stdout。
+"""
+
+import contextvars
+import sys
+from contextlib import contextmanager
+
+_target: contextvars.ContextVar = contextvars.ContextVar("stdout_target", default=None)
+
+
+class _StdoutRouter:
+    """sys.stdout 的替身：有目标时写入目标，否则写入原来的 stdout。"""
+
+    def __init__(self, fallback) -> None:
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        target = _target.get()
+        if target is None:
+            return self._fallback.write(text)
+        target.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        target = _target.get()
+        (self._fallback if target is None else target).flush()
+
+    def __getattr__(self, name: str):
+        # encoding / isatty / fileno 等属性沿用原来的 stdout
+        return getattr(self._fallback, name)
+
+
+def _install() -> None:
+    if not isinstance(sys.stdout, _StdoutRouter):
+        sys.stdout = _StdoutRouter(sys.stdout)  # type: ignore[assignment]
+
+
+@contextmanager
+def redirect_stdout(target):
+    """在当前上下文中把 print() 输出转发给 target（需提供 write/flush），退出时 flush。"""
+    _install()
+    token = _target.set(target)
+    try:
+        yield target
+    finally:
+        _target.reset(token)
+        target.flush()
@@ -3,9 +3,12 @@ stealth.py — 反检测 JavaScript 注入模块
 
 参考 hg3386628/zhihu-scraper 和 yuchenzhu-research/zhihu-scraper 的反爬策略。
 集成 WebGL、Canvas、AudioContext 指纹伪装以及 navigator.webdriver 覆盖。
+
+STEALTH_JS 在每个浏览器上下文中通过 add_init_script 注册一次，之后每个页面、每次导航
+都会执行；注册前去掉注释行和缩进，减少每次解析的脚本体积。
 """
 
-STEALTH_JS = """
+_STEALTH_SOURCE = """
 // 覆盖 navigator.webdriver
 Object.defineProperty(navigator, 'webdriver', {
     get: () => undefined,
@@ -98,3 +101,15 @@ Object.defineProperty(navigator, 'languages', {
     configurable: true
 });
 """
+
+
+def _compact_js(source: str) -> str:
+    """
+    去掉整行注释、缩进和空行，保留换行（不改变语句的自动分号插入）。
+    只适用于上面这种不含跨行字符串、行尾注释的脚本。
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+STEALTH_JS = _compact_js(_STEALTH_SOURCE)
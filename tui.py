@@ -16,8 +16,6 @@ tui.py — ZhiZhu 知蛛 终端交互界面
 
 from __future__ import annotations
 
-import asyncio
-import sys
 import threading
 from pathlib import Path
 from typing import Any
@@ -40,28 +38,76 @@ from textual.widgets import (
     Static,
 )
 
+from merge_md import merge
+from scraper import (
+    login,
+    run_async,
+    scrape_question,
+    scrape_single_answer,
+    scrape_user,
+    scrape_user_pins,
+)
+from stdout_router import redirect_stdout
+
 # ── stdout 重定向 ──────────────────────────────────────────────
 
 class _TUIWriter:
-    """将 print() 输出实时转发到 Textual RichLog 控件。"""
+    """
+    将 print() 输出转发到 Textual RichLog 控件。
 
-    def __init__(self, log: RichLog) -> None:
+    write() 在工作线程中调用：完整的行先攒进 _pending，由 UI 线程上的定时器
+    每 FLUSH_INTERVAL 秒最多合并写入一次，避免每行 print 都触发一次重绘。
+    与 webui 的 _QueueWriter 相同，不完整的行先存成片段，只在新写入的文本里查找换行，
+    一次很长的不带换行的输出也不会被反复拼接、扫描。
+    """
+
+    FLUSH_INTERVAL = 1 / 60
+
+    def __init__(self, app: App, log: RichLog) -> None:
+        self._app = app
         self._log = log
-        self._buf = ""
+        self._parts: list[str] = []
+        self._pending: list[str] = []
+        self._scheduled = False
+        self._lock = threading.Lock()
 
     def write(self, text: str) -> None:
-        self._buf += text
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
-            self._log.write(line)
+        with self._lock:
+            if "\n" not in text:
+                if text:
+                    self._parts.append(text)
+                return
+            lines = text.split("\n")
+            if self._parts:
+                self._parts.append(lines[0])
+                lines[0] = "".join(self._parts)
+            tail = lines.pop()
+            self._parts = [tail] if tail else []
+            self._pending.extend(lines)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._app.call_from_thread(
+            self._app.set_timer, self.FLUSH_INTERVAL, self._write_pending
+        )
 
-    def flush(self) -> None:
-        if self._buf:
-            self._log.write(self._buf)
-            self._buf = ""
+    def _write_pending(self) -> None:
+        """（UI 线程）把攒下的行一次性写入日志。"""
+        with self._lock:
+            lines, self._pending = self._pending, []
+            self._scheduled = False
+        if lines:
+            self._log.write("\n".join(lines))
 
-    def fileno(self) -> int:
-        return sys.__stdout__.fileno()
+    def flush(self) -> None:
+        """（工作线程）立即写出所有未写入的内容，包括末尾不完整的行。"""
+        with self._lock:
+            lines, self._pending = self._pending, []
+            if self._parts:
+                lines.append("".join(self._parts))
+                self._parts = []
+        if lines:
+            self._app.call_from_thread(self._log.write, "\n".join(lines))
 
 
 # ── 面板基类 ───────────────────────────────────────────────────
@@ -270,7 +316,8 @@ class ScrapeAnswerPanel(_Panel):
             placeholder="例：https://www.zhihu.com/question/12345/answer/67890",
         )
         yield Checkbox("附带评论区 (--with-comments)", id="with_comments")
-        for w in self._common_inputs():
+        # 只加载一个页面，没有请求间延迟
+        for w in self._common_inputs(show_delay=False):
             yield w
         yield Button("开始爬取", id="start_btn", variant="primary")
 
@@ -326,6 +373,8 @@ class MergePanel(_Panel):
             "sort_by": sort_val if sort_val != Select.BLANK else "date",
             "separator": sep,
             "title": title,
+            # 界面上可以随时修改排序/分隔符/标题，每次点击都重新合并
+            "force": True,
         }
 
 
@@ -340,6 +389,9 @@ _NAV_ITEMS = [
     ("合并文档",       "merge"),
 ]
 
+# 导航项控件 id → 功能 key
+_NAV_ID_TO_KEY = {f"nav_{key}": key for _, key in _NAV_ITEMS}
+
 _PANEL_MAP: dict[str, type[_Panel]] = {
     "login":           LoginPanel,
     "scrape_user":     ScrapeUserPanel,
@@ -429,6 +481,10 @@ class ZhiZhuApp(App):
         super().__init__()
         self._current_key = "login"
         self._running = False
+        # 所有面板在启动时一次性创建，切换功能时只切换显示，不重建控件（表单内容也会保留）
+        self._panels: dict[str, _Panel] = {
+            key: panel_cls(id=f"panel_{key}") for key, panel_cls in _PANEL_MAP.items()
+        }
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -441,7 +497,9 @@ class ZhiZhuApp(App):
         # 主区域
         with Vertical(id="main-area"):
             with ScrollableContainer(id="panel-container"):
-                yield LoginPanel(id="active_panel")
+                for key, panel in self._panels.items():
+                    panel.display = key == self._current_key
+                    yield panel
             yield Static("[bold]实时日志[/bold]", id="log-title")
             yield RichLog(id="log", highlight=True, markup=True, wrap=True)
         yield Footer()
@@ -453,22 +511,19 @@ class ZhiZhuApp(App):
 
     @on(ListView.Selected, "#nav")
     def nav_selected(self, event: ListView.Selected) -> None:
-        if event.item.id is None:
-            return
-        key = event.item.id.replace("nav_", "")
-        self._switch_panel(key)
+        key = _NAV_ID_TO_KEY.get(event.item.id)
+        if key is not None:
+            self._switch_panel(key)
 
     def _switch_panel(self, key: str) -> None:
         if self._running:
             self.notify("请等待当前任务完成后再切换功能", severity="warning")
             return
+        if key not in self._panels or key == self._current_key:
+            return
+        self._panels[self._current_key].display = False
+        self._panels[key].display = True
         self._current_key = key
-        container = self.query_one("#panel-container", ScrollableContainer)
-        old = container.query("_Panel")
-        for w in old:
-            w.remove()
-        panel_cls = _PANEL_MAP.get(key, LoginPanel)
-        container.mount(panel_cls(id="active_panel"))
 
     @on(Button.Pressed, "#start_btn")
     def start_task(self) -> None:
@@ -476,8 +531,7 @@ class ZhiZhuApp(App):
             self.notify("已有任务正在运行，请稍候", severity="warning")
             return
         try:
-            panel = self.query_one("#active_panel", _Panel)
-            params = panel.collect_params()
+            params = self._panels[self._current_key].collect_params()
         except ValueError as e:
             self.notify(str(e), severity="error")
             return
@@ -494,7 +548,7 @@ class ZhiZhuApp(App):
     def _set_running(self, value: bool) -> None:
         self._running = value
         try:
-            btn = self.query_one("#start_btn", Button)
+            btn = self._panels[self._current_key].query_one("#start_btn", Button)
             btn.disabled = value
             btn.label = "运行中..." if value else _get_btn_label(self._current_key)
         except Exception:
@@ -503,17 +557,13 @@ class ZhiZhuApp(App):
     @work(thread=True)
     def _run_task(self, key: str, params: dict[str, Any]) -> None:
         log = self.query_one("#log", RichLog)
-        writer = _TUIWriter(log)
-        old_stdout = sys.stdout
-        sys.stdout = writer  # type: ignore[assignment]
         error: Exception | None = None
-        try:
-            _dispatch(key, params)
-        except Exception as e:
-            error = e
-        finally:
-            sys.stdout = old_stdout
-            writer.flush()
+        # 只转发本工作线程（及其中的 asyncio 任务）的输出，不替换全局 sys.stdout
+        with redirect_stdout(_TUIWriter(self, log)):
+            try:
+                _dispatch(key, params)
+            except Exception as e:
+                error = e
 
         if error:
             self.call_from_thread(
@@ -531,32 +581,22 @@ class ZhiZhuApp(App):
 
 # ── 任务分发 ───────────────────────────────────────────────────
 
-def _dispatch(key: str, params: dict[str, Any]) -> None:
-    """根据功能 key 调用对应的 scraper/merge 函数（在 Worker 线程中执行）。"""
-
-    if key == "login":
-        from scraper import login
-        asyncio.run(login(**params))
-
-    elif key == "scrape_user":
-        from scraper import scrape_user
-        asyncio.run(scrape_user(**params))
-
-    elif key == "scrape_pins":
-        from scraper import scrape_user_pins
-        asyncio.run(scrape_user_pins(**params))
-
-    elif key == "scrape_question":
-        from scraper import scrape_question
-        asyncio.run(scrape_question(**params))
+# 各功能 key 对应的 scraper 协程函数
+_SCRAPER_TASKS = {
+    "login":           login,
+    "scrape_user":     scrape_user,
+    "scrape_pins":     scrape_user_pins,
+    "scrape_question": scrape_question,
+    "scrape_answer":   scrape_single_answer,
+}
 
-    elif key == "scrape_answer":
-        from scraper import scrape_single_answer
-        asyncio.run(scrape_single_answer(**params))
 
-    elif key == "merge":
-        from merge_md import merge
+def _dispatch(key: str, params: dict[str, Any]) -> None:
+    """根据功能 key 调用对应的 scraper/merge 函数（在 Worker 线程中执行）。"""
+    if key == "merge":
         merge(**params)
+    else:
+        run_async(_SCRAPER_TASKS[key](**params))
 
 
 def _get_btn_label(key: str) -> str:
@@ -20,103 +20,306 @@ webui.py — ZhiZhu 知蛛 Web 交互界面
 from __future__ import annotations
 
 import asyncio
-import queue
-import sys
+import atexit
+import inspect
+import os
 import threading
+from collections import deque
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator
 
 import gradio as gr
 
+from merge_md import collect_md_files, merge
+from scraper import (
+    MAX_PARALLEL_PAGES,
+    _event_loop_factory,
+    create_http_client,
+    login,
+    scrape_question,
+    scrape_single_answer,
+    scrape_user,
+    scrape_user_pins,
+)
+from stdout_router import redirect_stdout
+
+# 日志框的刷新间隔（秒）和最多显示的行数
+LOG_YIELD_INTERVAL = 0.1
+LOG_MAX_LINES = 2000
+
 
 # ── stdout 重定向 ──────────────────────────────────────────────
 
 class _QueueWriter:
-    """将 print() 输出收集到 queue.Queue，供生成器逐行 yield 给 Gradio。"""
+    """
+    将 print() 输出按行放入 asyncio.Queue，供 _stream_logs 逐批 yield 给 Gradio。
+
+    write() 可能在任意线程中调用（共享事件循环、merge 的工作线程），
+    因此通过 loop.call_soon_threadsafe 把行交给队列所在的事件循环。
+    每次 write() 中的所有完整行作为一个列表一起放入队列；不完整的行先存成片段，
+    只在新写入的文本里查找换行，一次很长的 write() 也不会被反复拼接、扫描。
+    """
 
-    def __init__(self, q: queue.Queue) -> None:
+    def __init__(self, q: asyncio.Queue, loop: asyncio.AbstractEventLoop) -> None:
         self._q = q
-        self._buf = ""
+        self._loop = loop
+        self._parts: list[str] = []
+
+    def _put(self, lines: list[str]) -> None:
+        self._loop.call_soon_threadsafe(self._q.put_nowait, lines)
 
     def write(self, text: str) -> None:
-        self._buf += text
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
-            self._q.put(line)
+        if "\n" not in text:
+            if text:
+                self._parts.append(text)
+            return
+        lines = text.split("\n")
+        if self._parts:
+            self._parts.append(lines[0])
+            lines[0] = "".join(self._parts)
+        tail = lines.pop()
+        self._parts = [tail] if tail else []
+        self._put(lines)
 
     def flush(self) -> None:
-        if self._buf:
-            self._q.put(self._buf)
-            self._buf = ""
+        if self._parts:
+            self._put(["".join(self._parts)])
+            self._parts = []
+
+
+# ── 共享事件循环 ──────────────────────────────────────────────
 
-    def fileno(self) -> int:
-        return sys.__stdout__.fileno()
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
 
 
-def _run_in_thread(fn, q: queue.Queue) -> None:
-    """在子线程中执行 fn()，完成后向队列推送 None（结束信号）。"""
-    old_stdout = sys.stdout
-    sys.stdout = _QueueWriter(q)  # type: ignore[assignment]
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    返回常驻后台线程中的共享事件循环（首次调用时启动）。
+
+    所有爬取任务都提交到这个循环上运行，不再每次点击都新建、销毁一个事件循环，
+    跨任务共享的资源（如 HTTP 连接池）因此可以一直保留。
+    循环实现与命令行相同（见 scraper._event_loop_factory，已安装时使用 uvloop）。
+    """
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            factory = _event_loop_factory()
+            loop = factory() if factory is not None else asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="zhizhu-loop", daemon=True).start()
+            _LOOP = loop
+    return _LOOP
+
+
+_HTTP_CLIENT = None
+
+
+def _http_client():
+    """
+    （在共享事件循环中调用）返回各任务共用的 HTTP/2 keep-alive 客户端，首次调用时创建。
+    图片下载在多次点击之间复用同一个连接池，不必每个任务重新握手。
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = create_http_client()
+    return _HTTP_CLIENT
+
+
+_PLAYWRIGHT_START: asyncio.Future | None = None
+
+
+async def _playwright():
+    """
+    （在共享事件循环中调用）返回各任务共用的 Playwright 实例，首次调用时启动。
+
+    Playwright 驱动进程只启动一次；浏览器上下文仍由每个任务自己打开和关闭，
+    因为所有任务共用同一个 browser_data 登录配置，同一时间只能有一个浏览器使用它。
+    """
+    global _PLAYWRIGHT_START
+    if _PLAYWRIGHT_START is None:
+        from playwright.async_api import async_playwright
+        _PLAYWRIGHT_START = asyncio.ensure_future(async_playwright().start())
     try:
-        fn()
-    except Exception as e:
-        sys.stdout.write(f"\n[ERROR] {e}\n")  # type: ignore[union-attr]
-    finally:
-        sys.stdout.flush()  # type: ignore[union-attr]
-        sys.stdout = old_stdout
-        q.put(None)  # 结束信号
+        return await asyncio.shield(_PLAYWRIGHT_START)
+    except Exception:
+        _PLAYWRIGHT_START = None
+        raise
+
 
+async def _close_shared_async() -> None:
+    if _PLAYWRIGHT_START is not None and _PLAYWRIGHT_START.done() and not _PLAYWRIGHT_START.exception():
+        await _PLAYWRIGHT_START.result().stop()
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
 
-def _stream_logs(fn) -> Generator[str, None, None]:
+
+@atexit.register
+def _close_shared() -> None:
+    """退出时停止共享的 Playwright 实例并关闭共享的 HTTP 客户端。"""
+    if _LOOP is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_shared_async(), _LOOP).result(timeout=10)
+    except Exception:
+        pass
+
+
+# 同时使用浏览器的任务数：所有任务共用同一个 browser_data 登录配置，
+# Chromium 不允许两个浏览器同时打开同一个配置目录，多出的任务在共享循环上排队
+_BROWSER_JOBS = asyncio.Semaphore(1)
+
+
+async def _run_with_output(coro, writer: _QueueWriter) -> None:
+    """（在共享事件循环中运行）排队获得浏览器后执行 coro，期间本任务的 print() 输出都写入 writer。"""
+    with redirect_stdout(writer):
+        try:
+            if _BROWSER_JOBS.locked():
+                print("⏳ 另一个任务正在使用浏览器，已排队，前面的任务完成后自动开始...")
+            async with _BROWSER_JOBS:
+                await coro
+        except Exception as e:
+            writer.write(f"\n[ERROR] {e}\n")
+        finally:
+            # 排队期间被取消时协程从未开始，关闭它以免出现 "never awaited" 警告
+            coro.close()
+
+
+def _call_with_output(fn, args: tuple, writer: _QueueWriter) -> None:
+    """（在工作线程中运行）执行普通函数 fn(*args)，期间的 print() 输出都写入 writer。"""
+    with redirect_stdout(writer):
+        try:
+            fn(*args)
+        except SystemExit as e:
+            # merge() 出错时调用 sys.exit()：必须在这里拦下，
+            # 否则会经由 asyncio.to_thread 的任务在 Gradio 的事件循环中重新抛出，导致整个服务退出
+            writer.write(f"\n[ERROR] 任务中止（退出码 {e.code}），详细原因见终端输出\n")
+        except Exception as e:
+            writer.write(f"\n[ERROR] {e}\n")
+
+
+async def _stream_logs(fn, *args) -> AsyncGenerator[str, None]:
     """
     通用流式日志生成器。
-    将 fn() 产生的所有 print() 输出实时 yield 给 Gradio Textbox。
+    将 fn(*args) 产生的所有 print() 输出实时 yield 给 Gradio Textbox。
+
+    协程函数提交到共享事件循环运行，普通函数（merge）放到工作线程运行；
+    Gradio 这边只需等待队列，不再为每次点击占用一个阻塞在 queue.get() 上的线程。
+    输出按任务上下文转发，多个会话同时运行任务时日志不会互相串。
     """
-    q: queue.Queue = queue.Queue()
-    t = threading.Thread(target=_run_in_thread, args=(fn, q), daemon=True)
-    t.start()
-    log_lines: list[str] = []
-    while True:
-        item = q.get()
-        if item is None:
-            break
-        log_lines.append(item)
-        yield "\n".join(log_lines)
-    t.join()
-    yield "\n".join(log_lines)
-
-
-# ── 辅助：解析输出目录 ─────────────────────────────────────────
+    q: asyncio.Queue = asyncio.Queue()
+    writer = _QueueWriter(q, asyncio.get_running_loop())
+
+    if inspect.iscoroutinefunction(fn):
+        future = asyncio.run_coroutine_threadsafe(
+            _run_with_output(fn(*args), writer), _get_loop()
+        )
+        job = asyncio.wrap_future(future)
+    else:
+        job = asyncio.ensure_future(asyncio.to_thread(_call_with_output, fn, args, writer))
+    # 输出行和完成通知都按顺序经由本循环投递，结束信号一定排在最后一行之后
+    job.add_done_callback(lambda _: q.put_nowait(None))
+
+    # 每次 yield 都会把整个日志重新发送给浏览器，因此：
+    # 攒 LOG_YIELD_INTERVAL 秒内的所有行一起 yield，并且只保留最近 LOG_MAX_LINES 行
+    log_lines: deque[str] = deque(maxlen=LOG_MAX_LINES)
+    dropped = 0
+    finished = False
+    try:
+        while not finished:
+            item = await q.get()
+            await asyncio.sleep(LOG_YIELD_INTERVAL)
+            while True:
+                if item is None:
+                    finished = True
+                    break
+                dropped += max(0, len(log_lines) + len(item) - LOG_MAX_LINES)
+                log_lines.extend(item)
+                try:
+                    item = q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            text = "\n".join(log_lines)
+            if dropped:
+                text = f"……（已省略前 {dropped} 行，仅显示最近 {LOG_MAX_LINES} 行）\n" + text
+            yield text
+    finally:
+        # 点击「取消」或关闭页面时 Gradio 会取消本生成器：同时取消共享循环上的任务，
+        # 爬虫的 finally 随之关闭浏览器上下文，不会在后台继续跑下去。
+        # （merge 在工作线程中运行，无法中途打断，只能等它自行结束）
+        if not job.done():
+            job.cancel()
+
+
+# ── 辅助：输入校验、输出目录与按钮 ─────────────────────────────
+# 校验函数返回错误提示，输入有效时返回空字符串；在提交任务前调用，
+# 无效输入直接提示，不会排队占用浏览器，也不会在爬取几个小时后才因权限报错。
 
 def _parse_output(val: str) -> Path | None:
     val = val.strip()
     return Path(val) if val else None
 
 
+def _check_delays(delay_min, delay_max) -> str:
+    try:
+        lo, hi = float(delay_min), float(delay_max)
+    except (TypeError, ValueError):
+        return "请填写最小延迟和最大延迟"
+    if lo < 0 or hi < 0:
+        return "延迟不能为负数"
+    if lo > hi:
+        return "最小延迟不能大于最大延迟"
+    return ""
+
+
+def _check_writable(path: Path | None) -> str:
+    """检查目录 path（可以尚不存在）能否写入：向上找到最近一个已存在的目录并检查权限。"""
+    if path is None:
+        return ""
+    p = path.absolute()
+    while not p.exists() and p != p.parent:
+        p = p.parent
+    if not p.is_dir():
+        return f"输出路径不可用：{p} 不是目录"
+    if not os.access(p, os.W_OK | os.X_OK):
+        return f"没有写入权限：{p}"
+    return ""
+
+
+def _run_buttons(label: str) -> tuple[gr.Button, gr.Button]:
+    """并排的「开始」和「取消」按钮；取消按钮需绑定为 stop.click(fn=None, cancels=[事件])。"""
+    with gr.Row():
+        btn = gr.Button(label, variant="primary")
+        stop = gr.Button("取消", variant="stop")
+    return btn, stop
+
+
 # ── 登录 ───────────────────────────────────────────────────────
 
-def _login_fn(timeout: int):
-    from scraper import login
-    asyncio.run(login(timeout=int(timeout)))
+async def _login_fn(timeout: int):
+    await login(timeout=int(timeout), playwright=await _playwright())
 
 
 def login_tab() -> None:
     gr.Markdown("## 登录知乎\n首次使用需要手动在浏览器中完成登录，登录状态会持久化保存。")
     timeout = gr.Number(value=300, label="等待超时（秒）", precision=0)
-    btn = gr.Button("打开浏览器并登录", variant="primary")
+    btn, stop = _run_buttons("打开浏览器并登录")
     log = gr.Textbox(label="日志", lines=12, interactive=False, autoscroll=True)
 
-    def run(t):
-        yield from _stream_logs(lambda: _login_fn(t))
+    async def run(t):
+        if not t or t <= 0:
+            yield "等待超时必须是正数"
+            return
+        async for text in _stream_logs(_login_fn, t):
+            yield text
 
-    btn.click(fn=run, inputs=[timeout], outputs=[log])
+    event = btn.click(fn=run, inputs=[timeout], outputs=[log])
+    stop.click(fn=None, cancels=[event])
 
 
 # ── 爬取用户 ──────────────────────────────────────────────────
 
-def _scrape_user_fn(token, do_answers, do_articles, no_images, delay_min, delay_max, headless, out_dir):
-    from scraper import scrape_user
-    asyncio.run(scrape_user(
+async def _scrape_user_fn(token, do_answers, do_articles, no_images, delay_min, delay_max, headless, pages, out_dir):
+    await scrape_user(
         user_url_token=token.strip(),
         scrape_answers=do_answers,
         scrape_articles=do_articles,
@@ -124,8 +327,11 @@ def _scrape_user_fn(token, do_answers, do_articles, no_images, delay_min, delay_
         delay_min=float(delay_min),
         delay_max=float(delay_max),
         headless=headless,
+        parallel_pages=int(pages),
         output_dir=_parse_output(out_dir),
-    ))
+        http_client=_http_client(),
+        playwright=await _playwright(),
+    )
 
 
 def scrape_user_tab() -> None:
@@ -141,30 +347,42 @@ def scrape_user_tab() -> None:
     with gr.Row():
         delay_min = gr.Number(value=10, label="最小延迟（秒）", precision=1)
         delay_max = gr.Number(value=20, label="最大延迟（秒）", precision=1)
-    btn = gr.Button("开始爬取", variant="primary")
+        pages = gr.Slider(1, 8, value=MAX_PARALLEL_PAGES, step=1, label="并发页面数（共享同一限速）")
+    btn, stop = _run_buttons("开始爬取")
     log = gr.Textbox(label="实时日志", lines=18, interactive=False, autoscroll=True)
 
-    def run(tok, da, dart, ni, dmin, dmax, hl, od):
+    async def run(tok, da, dart, ni, dmin, dmax, hl, pg, od):
         if not tok.strip():
             yield "请先填写用户 URL Token"
             return
-        yield from _stream_logs(lambda: _scrape_user_fn(tok, da, dart, ni, dmin, dmax, hl, od))
+        if not (da or dart):
+            yield "请至少勾选「爬取回答」或「爬取文章」"
+            return
+        err = _check_delays(dmin, dmax) or _check_writable(_parse_output(od))
+        if err:
+            yield err
+            return
+        async for text in _stream_logs(_scrape_user_fn, tok, da, dart, ni, dmin, dmax, hl, pg, od):
+            yield text
 
-    btn.click(fn=run, inputs=[token, do_answers, do_articles, no_images, delay_min, delay_max, headless, out_dir], outputs=[log])
+    event = btn.click(fn=run, inputs=[token, do_answers, do_articles, no_images, delay_min, delay_max, headless, pages, out_dir], outputs=[log])
+    stop.click(fn=None, cancels=[event])
 
 
 # ── 爬取用户想法 ───────────────────────────────────────────────
 
-def _scrape_pins_fn(token, no_images, delay_min, delay_max, headless, out_dir):
-    from scraper import scrape_user_pins
-    asyncio.run(scrape_user_pins(
+async def _scrape_pins_fn(token, no_images, delay_min, delay_max, headless, pages, out_dir):
+    await scrape_user_pins(
         user_url_token=token.strip(),
         download_img=not no_images,
         delay_min=float(delay_min),
         delay_max=float(delay_max),
         headless=headless,
+        parallel_pages=int(pages),
         output_dir=_parse_output(out_dir),
-    ))
+        http_client=_http_client(),
+        playwright=await _playwright(),
+    )
 
 
 def scrape_pins_tab() -> None:
@@ -178,32 +396,42 @@ def scrape_pins_tab() -> None:
     with gr.Row():
         delay_min = gr.Number(value=10, label="最小延迟（秒）", precision=1)
         delay_max = gr.Number(value=20, label="最大延迟（秒）", precision=1)
-    btn = gr.Button("开始爬取", variant="primary")
+        pages = gr.Slider(1, 8, value=MAX_PARALLEL_PAGES, step=1, label="并发页面数（共享同一限速）")
+    btn, stop = _run_buttons("开始爬取")
     log = gr.Textbox(label="实时日志", lines=18, interactive=False, autoscroll=True)
 
-    def run(tok, ni, dmin, dmax, hl, od):
+    async def run(tok, ni, dmin, dmax, hl, pg, od):
         if not tok.strip():
             yield "请先填写用户 URL Token"
             return
-        yield from _stream_logs(lambda: _scrape_pins_fn(tok, ni, dmin, dmax, hl, od))
+        err = _check_delays(dmin, dmax) or _check_writable(_parse_output(od))
+        if err:
+            yield err
+            return
+        async for text in _stream_logs(_scrape_pins_fn, tok, ni, dmin, dmax, hl, pg, od):
+            yield text
 
-    btn.click(fn=run, inputs=[token, no_images, delay_min, delay_max, headless, out_dir], outputs=[log])
+    event = btn.click(fn=run, inputs=[token, no_images, delay_min, delay_max, headless, pages, out_dir], outputs=[log])
+    stop.click(fn=None, cancels=[event])
 
 
 # ── 爬取问题 ──────────────────────────────────────────────────
 
-def _scrape_question_fn(question_input, max_answers, no_images, delay_min, delay_max, headless, out_dir):
-    from scraper import scrape_question
-    max_n = int(max_answers) if str(max_answers).strip().isdigit() else None
-    asyncio.run(scrape_question(
+async def _scrape_question_fn(question_input, max_answers, no_images, delay_min, delay_max, headless, pages, out_dir):
+    # 已在 run() 中校验：留空表示全部，否则为正整数
+    max_n = int(max_answers) if str(max_answers).strip() else None
+    await scrape_question(
         question_input=question_input.strip(),
         max_answers=max_n,
         download_img=not no_images,
         delay_min=float(delay_min),
         delay_max=float(delay_max),
         headless=headless,
+        parallel_pages=int(pages),
         output_dir=_parse_output(out_dir),
-    ))
+        http_client=_http_client(),
+        playwright=await _playwright(),
+    )
 
 
 def scrape_question_tab() -> None:
@@ -221,31 +449,41 @@ def scrape_question_tab() -> None:
     with gr.Row():
         delay_min = gr.Number(value=10, label="最小延迟（秒）", precision=1)
         delay_max = gr.Number(value=20, label="最大延迟（秒）", precision=1)
-    btn = gr.Button("开始爬取", variant="primary")
+        pages = gr.Slider(1, 8, value=MAX_PARALLEL_PAGES, step=1, label="并发页面数（共享同一限速）")
+    btn, stop = _run_buttons("开始爬取")
     log = gr.Textbox(label="实时日志", lines=18, interactive=False, autoscroll=True)
 
-    def run(qi, ma, ni, dmin, dmax, hl, od):
+    async def run(qi, ma, ni, dmin, dmax, hl, pg, od):
         if not qi.strip():
             yield "请先填写问题 URL 或 ID"
             return
-        yield from _stream_logs(lambda: _scrape_question_fn(qi, ma, ni, dmin, dmax, hl, od))
+        ma_text = str(ma).strip()
+        if ma_text and not (ma_text.isdecimal() and int(ma_text) > 0):
+            yield "最大回答数必须是正整数（留空爬取全部）"
+            return
+        err = _check_delays(dmin, dmax) or _check_writable(_parse_output(od))
+        if err:
+            yield err
+            return
+        async for text in _stream_logs(_scrape_question_fn, qi, ma, ni, dmin, dmax, hl, pg, od):
+            yield text
 
-    btn.click(fn=run, inputs=[question_input, max_answers, no_images, delay_min, delay_max, headless, out_dir], outputs=[log])
+    event = btn.click(fn=run, inputs=[question_input, max_answers, no_images, delay_min, delay_max, headless, pages, out_dir], outputs=[log])
+    stop.click(fn=None, cancels=[event])
 
 
 # ── 爬取单个回答 ───────────────────────────────────────────────
 
-def _scrape_answer_fn(answer_url, with_comments, no_images, delay_min, delay_max, headless, out_dir):
-    from scraper import scrape_single_answer
-    asyncio.run(scrape_single_answer(
+async def _scrape_answer_fn(answer_url, with_comments, no_images, headless, out_dir):
+    await scrape_single_answer(
         answer_input=answer_url.strip(),
         with_comments=with_comments,
         download_img=not no_images,
-        delay_min=float(delay_min),
-        delay_max=float(delay_max),
         headless=headless,
         output_dir=_parse_output(out_dir),
-    ))
+        http_client=_http_client(),
+        playwright=await _playwright(),
+    )
 
 
 def scrape_answer_tab() -> None:
@@ -260,33 +498,42 @@ def scrape_answer_tab() -> None:
         with_comments = gr.Checkbox(label="附带评论区（--with-comments）", value=False)
         no_images = gr.Checkbox(label="不下载图片（--no-images）", value=False)
         headless = gr.Checkbox(label="无头模式（不显示浏览器）", value=False)
-    with gr.Row():
-        delay_min = gr.Number(value=10, label="最小延迟（秒）", precision=1)
-        delay_max = gr.Number(value=20, label="最大延迟（秒）", precision=1)
-    btn = gr.Button("开始爬取", variant="primary")
+    btn, stop = _run_buttons("开始爬取")
     log = gr.Textbox(label="实时日志", lines=18, interactive=False, autoscroll=True)
 
-    def run(url, wc, ni, dmin, dmax, hl, od):
+    async def run(url, wc, ni, hl, od):
         if not url.strip():
             yield "请先填写回答 URL"
             return
-        yield from _stream_logs(lambda: _scrape_answer_fn(url, wc, ni, dmin, dmax, hl, od))
+        err = _check_writable(_parse_output(od))
+        if err:
+            yield err
+            return
+        async for text in _stream_logs(_scrape_answer_fn, url, wc, ni, hl, od):
+            yield text
 
-    btn.click(fn=run, inputs=[answer_url, with_comments, no_images, delay_min, delay_max, headless, out_dir], outputs=[log])
+    event = btn.click(fn=run, inputs=[answer_url, with_comments, no_images, headless, out_dir], outputs=[log])
+    stop.click(fn=None, cancels=[event])
 
 
 # ── 合并文档 ──────────────────────────────────────────────────
 
-def _merge_fn(source_dir, output_file, sort_by, separator, title):
-    from merge_md import merge
+def _merge_paths(source_dir: str, output_file: str) -> tuple[Path, Path]:
     src = Path(source_dir.strip())
     out = Path(output_file.strip()) if output_file.strip() else src.parent / f"{src.name}_merged.md"
+    return src, out
+
+
+def _merge_fn(source_dir, output_file, sort_by, separator, title):
+    src, out = _merge_paths(source_dir, output_file)
     merge(
         source_dir=src,
         output_file=out,
         sort_by=sort_by,
         separator=separator or "---",
         title=title.strip(),
+        # 界面上可以随时修改排序/分隔符/标题，每次点击都重新合并
+        force=True,
     )
 
 
@@ -312,26 +559,43 @@ def merge_tab() -> None:
     btn = gr.Button("开始合并", variant="primary")
     log = gr.Textbox(label="日志", lines=8, interactive=False, autoscroll=True)
 
-    def run(sd, of, sb, sep, t):
+    async def run(sd, of, sb, sep, t):
         if not sd.strip():
             yield "请先填写来源目录"
             return
-        yield from _stream_logs(lambda: _merge_fn(sd, of, sb, sep, t))
+        src, out = _merge_paths(sd, of)
+        if not src.is_dir():
+            yield f"来源目录不存在: {src}"
+            return
+        if not await asyncio.to_thread(collect_md_files, src):
+            yield f"目录中未找到任何 .md 文件: {src}"
+            return
+        err = _check_writable(out.parent)
+        if err:
+            yield err
+            return
+        async for text in _stream_logs(_merge_fn, sd, of, sb, sep, t):
+            yield text
 
     btn.click(fn=run, inputs=[source_dir, output_file, sort_by, separator, title], outputs=[log])
 
 
 # ── 主界面 ────────────────────────────────────────────────────
 
+# 主题和样式只在导入时构建一次，重复调用 build_app()（如开发模式热重载）时直接复用
+THEME = gr.themes.Soft()
+CSS = """
+#header { text-align: center; margin-bottom: 8px; }
+#header h1 { font-size: 2em; }
+#header p  { color: #888; margin-top: 0; }
+"""
+
+
 def build_app() -> gr.Blocks:
     with gr.Blocks(
         title="ZhiZhu 知蛛 — 知乎内容爬虫",
-        theme=gr.themes.Soft(),
-        css="""
-        #header { text-align: center; margin-bottom: 8px; }
-        #header h1 { font-size: 2em; }
-        #header p  { color: #888; margin-top: 0; }
-        """,
+        theme=THEME,
+        css=CSS,
     ) as app:
         with gr.Column(elem_id="header"):
             gr.Markdown(